@@ -0,0 +1,73 @@
+import random
+import sys
+import time
+
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_queue import PartiallyRetroactiveQueue
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_stack import PartiallyRetroactiveStack
+from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import PartiallyRetroactivePriorityQueue
+
+
+def history_and_batch(n, k, seed=0):
+
+    """
+    Returns n time-sorted enqueue/push operations at even times and k backdated ones at odd times in random order.
+    """
+
+    rng = random.Random(seed)
+    history = [(t, True, t) for t in range(0, 2 * n, 2)]
+    batch = [(t, True, t) for t in rng.sample(range(1, 2 * n, 2), k)]
+    return history, batch
+
+
+def benchmark_structure(cls, n, k):
+
+    """
+    Applies a batch of k backdated operations to a structure with n operations, in a loop and with apply_batch.
+    """
+
+    history, batch = history_and_batch(n, k)
+    looped = cls.from_operations(history)
+    insert = looped.insert_enqueue if cls is PartiallyRetroactiveQueue else looped.insert_push
+    start = time.perf_counter()
+    for t, _, value in batch:
+        insert(value, t)
+    loop_time = time.perf_counter() - start
+    batched = cls.from_operations(history)
+    start = time.perf_counter()
+    batched.apply_batch(batch)
+    return loop_time, time.perf_counter() - start
+
+
+def benchmark_priority_queue(n, k):
+
+    """
+    Applies a batch of k backdated inserts to a priority queue with n inserts, in a loop and with apply_batch.
+    """
+
+    rng = random.Random(0)
+    history = [(t, True, rng.random(), None) for t in range(0, 2 * n, 2)]
+    batch = [(t, True, rng.random(), None) for t in rng.sample(range(1, 2 * n, 2), k)]
+    looped = PartiallyRetroactivePriorityQueue()
+    looped.apply_batch(history)
+    start = time.perf_counter()
+    for t, _, value, data in batch:
+        looped.add_insert(t, value, data)
+    loop_time = time.perf_counter() - start
+    batched = PartiallyRetroactivePriorityQueue()
+    batched.apply_batch(history)
+    start = time.perf_counter()
+    batched.apply_batch(batch)
+    return loop_time, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+    for k in [n // 1000, n // 100, n // 10, n]:
+        results = [
+            ("queue", benchmark_structure(PartiallyRetroactiveQueue, n, k)),
+            ("stack", benchmark_structure(PartiallyRetroactiveStack, n, k)),
+            ("priority queue", benchmark_priority_queue(n, k)),
+        ]
+        print(f"n={n} k={k}  " + "  ".join(
+            f"{name} loop {loop_time:7.3f}s batch {batch_time:7.3f}s" for name, (loop_time, batch_time) in results
+        ))
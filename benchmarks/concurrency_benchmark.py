@@ -0,0 +1,94 @@
+import sys
+import threading
+import time
+
+from retroactive_data_structures.concurrency import ConcurrentPriorityQueue
+from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import PartiallyRetroactivePriorityQueue
+
+
+def run(readers, duration, read, write):
+
+    """
+    Runs the given number of reader threads calling read and one writer thread calling write(i) for duration seconds.
+    Returns the number of reads and writes per second.
+    """
+
+    done = threading.Event()
+    read_counts = [0] * readers
+    write_count = [0]
+
+    def reader(index):
+        count = 0
+        while not done.is_set():
+            read()
+            count += 1
+        read_counts[index] = count
+
+    def writer():
+        count = 0
+        while not done.is_set():
+            write(count)
+            count += 1
+        write_count[0] = count
+
+    threads = [threading.Thread(target=reader, args=(index,)) for index in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    done.set()
+    for thread in threads:
+        thread.join()
+    return sum(read_counts) / duration, write_count[0] / duration
+
+
+def benchmark_mutex(readers, duration):
+
+    """
+    Reads and writes a priority queue under a single mutex.
+    """
+
+    priority_queue = PartiallyRetroactivePriorityQueue()
+    lock = threading.Lock()
+
+    def read():
+        with lock:
+            return priority_queue.get_min()
+
+    def write(i):
+        with lock:
+            priority_queue.add_insert(-i, i % 1000, None)
+
+    return run(readers, duration, read, write)
+
+
+def benchmark_front_end(readers, duration, use_lock):
+
+    """
+    Reads a ConcurrentPriorityQueue through the read-write lock or through the published present state.
+    """
+
+    priority_queue = ConcurrentPriorityQueue(PartiallyRetroactivePriorityQueue())
+    if use_lock:
+        def read():
+            return priority_queue.read(PartiallyRetroactivePriorityQueue.get_min)
+    else:
+        read = priority_queue.get_min
+
+    def write(i):
+        priority_queue.add_insert(-i, i % 1000, None)
+
+    return run(readers, duration, read, write)
+
+
+if __name__ == '__main__':
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    for readers in [1, 2, 4, 8]:
+        results = [
+            ("mutex", benchmark_mutex(readers, duration)),
+            ("read-write lock", benchmark_front_end(readers, duration, True)),
+            ("published", benchmark_front_end(readers, duration, False)),
+        ]
+        print(f"readers={readers}  " + "  ".join(
+            f"{name} {reads:9.0f} reads/s {writes:6.0f} writes/s" for name, (reads, writes) in results
+        ))
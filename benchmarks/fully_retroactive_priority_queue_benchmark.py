@@ -0,0 +1,86 @@
+import copy
+import heapq
+import random
+import sys
+import time
+import tracemalloc
+
+from retroactive_data_structures.fully_retroactive_priority_queue.fully_retroactive_priority_queue import \
+    FullyRetroactivePriorityQueue
+
+
+def random_operations(m, rng):
+
+    """
+    Returns m valid (time, is_insert, value) operations sorted by time, about two thirds of them inserts.
+    """
+
+    operations = []
+    size = 0
+    for t in sorted(rng.sample(range(10 * m), m)):
+        is_insert = size == 0 or rng.random() < 2 / 3
+        size += 1 if is_insert else -1
+        operations.append((t, is_insert, rng.random()))
+    return operations
+
+
+def naive_min_at(operations, t):
+
+    """
+    Replays all operations up to time t with a binary heap and returns the minimum value.
+    """
+
+    heap = []
+    for operation_time, is_insert, value in operations:
+        if operation_time > t:
+            break
+        if is_insert:
+            heapq.heappush(heap, value)
+        else:
+            heapq.heappop(heap)
+    return heap[0] if heap else None
+
+
+def benchmark_min_at(m, queries, seed=0):
+
+    """
+    Loads m operations in random order, then measures min_at at random times against a naive replay up to each time.
+    The memory of the loaded queue is measured as the bytes allocated by a deep copy, which keeps shared nodes shared.
+    """
+
+    rng = random.Random(seed)
+    operations = random_operations(m, rng)
+    shuffled = operations[:]
+    rng.shuffle(shuffled)
+    frpq = FullyRetroactivePriorityQueue()
+    inserts = [operation for operation in shuffled if operation[1]]
+    deletes = [operation for operation in shuffled if not operation[1]]
+    start = time.perf_counter()
+    for t, _, value in inserts:
+        frpq.add_insert(t, value, None)
+    for t, _, _ in sorted(deletes, reverse=True):
+        frpq.add_delete_min(t)
+    loaded = time.perf_counter()
+    tracemalloc.start()
+    frpq_copy = copy.deepcopy(frpq)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del frpq_copy
+
+    times = [rng.randrange(10 * m) for _ in range(queries)]
+    start_queries = time.perf_counter()
+    for t in times:
+        frpq.min_at(t)
+    queried = time.perf_counter()
+    for t in times:
+        naive_min_at(operations, t)
+    replayed = time.perf_counter()
+    return (loaded - start) / m, (queried - start_queries) / queries, (replayed - queried) / queries, memory / m
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10 ** 3, 10 ** 4, 10 ** 5]
+    for m in sizes:
+        update, query, replay, memory = benchmark_min_at(m, 200)
+        print(f"m={m:>9}  update {update * 1e6:9.1f}us  min_at {query * 1e6:9.1f}us  naive replay {replay * 1e6:9.1f}us  "
+              f"memory {memory / 1024:6.1f} KiB/op")
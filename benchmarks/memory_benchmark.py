@@ -0,0 +1,28 @@
+import sys
+import tracemalloc
+
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_queue import PartiallyRetroactiveQueue
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_stack import PartiallyRetroactiveStack
+
+
+def bytes_per_operation(cls, n):
+
+    """
+    Returns the number of bytes allocated per operation by a structure built from n pushes/enqueues.
+    """
+
+    operations = [(t, True, t) for t in range(n)]
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    structure = cls.from_operations(operations)
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del structure
+    return (end - start) / n
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10 ** 4, 10 ** 5, 10 ** 6]
+    for n in sizes:
+        print(f"n={n:>9}  queue {bytes_per_operation(PartiallyRetroactiveQueue, n):7.1f} B/op  "
+              f"stack {bytes_per_operation(PartiallyRetroactiveStack, n):7.1f} B/op")
@@ -0,0 +1,67 @@
+import copy
+import random
+import sys
+import time
+import tracemalloc
+
+from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import PartiallyRetroactivePriorityQueue
+
+
+def build(n, persistent, seed=0):
+
+    """
+    Returns a priority queue with n inserts at even times, and the random generator used to make it.
+    """
+
+    rng = random.Random(seed)
+    prpq = PartiallyRetroactivePriorityQueue(persistent)
+    prpq.apply_batch([(t, True, rng.random(), None) for t in range(0, 2 * n, 2)])
+    return prpq, rng
+
+
+def benchmark_updates(n, k, persistent):
+
+    """
+    Adds k backdated inserts to a priority queue with n inserts and returns the time per update.
+    """
+
+    prpq, rng = build(n, persistent)
+    times = rng.sample(range(1, 2 * n, 2), k)
+    start = time.perf_counter()
+    for t in times:
+        prpq.add_insert(t, rng.random(), None)
+    return (time.perf_counter() - start) / k
+
+
+def benchmark_versions(n, k):
+
+    """
+    Adds k backdated inserts to a persistent priority queue with n inserts, keeping a snapshot after every update.
+    Returns the bytes allocated per kept version and the bytes of a deep copy of the queue.
+    """
+
+    prpq, rng = build(n, True)
+    times = rng.sample(range(1, 2 * n, 2), k)
+    versions = []
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    for t in times:
+        prpq.add_insert(t, rng.random(), None)
+        versions.append(prpq.snapshot())
+    end, _ = tracemalloc.get_traced_memory()
+    deep_copy = copy.deepcopy(prpq)
+    copied, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del deep_copy
+    return (end - start) / k, copied - end
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10 ** 3, 10 ** 4, 10 ** 5]
+    k = 1000
+    for n in sizes:
+        mutable_time = benchmark_updates(n, k, False)
+        persistent_time = benchmark_updates(n, k, True)
+        per_version, deep_copy = benchmark_versions(n, k)
+        print(f"n={n:>7}  update {mutable_time * 1e6:7.1f}us, persistent {persistent_time * 1e6:7.1f}us  "
+              f"{per_version / 1024:6.1f} KiB per version, deep copy {deep_copy / 1024:9.1f} KiB")
@@ -0,0 +1,62 @@
+import random
+import sys
+import time
+
+from retroactive_data_structures.partially_retroactive_priority_queue import zero_prefix_treap
+from retroactive_data_structures.partially_retroactive_priority_queue.treap import MaxTreapNode, MinTreapNode
+from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import PartiallyRetroactivePriorityQueue
+
+
+def count_calls(cls, name, counter):
+
+    """
+    Wraps the method of a class so that every call is counted in counter[name].
+    """
+
+    method = getattr(cls, name)
+
+    def counted(*args, **kwargs):
+        counter[name] += 1
+        return method(*args, **kwargs)
+
+    setattr(cls, name, counted)
+    return method
+
+
+def benchmark_add_insert(n, seed=0):
+
+    """
+    Measures n add_insert calls at random times, and counts the MinPrefixSumAggregator objects and aggregate updates
+    they cause.
+    """
+
+    rng = random.Random(seed)
+    times = rng.sample(range(10 * n), n)
+    prpq = PartiallyRetroactivePriorityQueue()
+    start = time.perf_counter()
+    for t in times:
+        prpq.add_insert(t, rng.random(), None)
+    elapsed = time.perf_counter() - start
+
+    counter = {"__init__": 0, "update_aggregate_value": 0}
+    counted_methods = [
+        (zero_prefix_treap.MinPrefixSumAggregator, "__init__"),
+        (MinTreapNode, "update_aggregate_value"),
+        (MaxTreapNode, "update_aggregate_value"),
+        (zero_prefix_treap.ZeroPrefixTreapNode, "update_aggregate_value"),
+    ]
+    originals = [(cls, name, count_calls(cls, name, counter)) for cls, name in counted_methods]
+    sample = 1000
+    for t in rng.sample(range(10 * n, 20 * n), sample):
+        prpq.add_insert(t, rng.random(), None)
+    for cls, name, method in originals:
+        setattr(cls, name, method)
+    return elapsed, counter["__init__"] / sample, counter["update_aggregate_value"] / sample
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10 ** 3, 10 ** 4, 10 ** 5]
+    for n in sizes:
+        elapsed, aggregators, updates = benchmark_add_insert(n)
+        print(f"n={n:>9}  add_insert {elapsed:8.3f}s  aggregator objects per add_insert {aggregators:6.1f}  "
+              f"aggregate updates per add_insert {updates:6.1f}")
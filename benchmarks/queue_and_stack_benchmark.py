@@ -0,0 +1,113 @@
+import gc
+import random
+import sys
+import time
+
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_queue import PartiallyRetroactiveQueue
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_stack import PartiallyRetroactiveStack
+
+
+def random_times(n, seed=0):
+
+    """
+    Returns n distinct operation times in random order.
+    """
+
+    rng = random.Random(seed)
+    times = list(range(1, 10 * n + 1, 10))
+    rng.shuffle(times)
+    return times
+
+
+def benchmark_queue(n):
+
+    """
+    Inserts n retroactive enqueues at random times and n // 4 dequeues, then deletes the dequeues and half of the enqueues.
+    """
+
+    times = random_times(n)
+    prq = PartiallyRetroactiveQueue()
+    start = time.perf_counter()
+    for i, t in enumerate(times):
+        prq.insert_enqueue(value=i, time=t)
+    dequeue_times = [prq.insert_dequeue().time for _ in range(n // 4)]
+    inserted = time.perf_counter()
+    for t in reversed(dequeue_times):
+        prq.delete_operation(time=t)
+    for t in times[:n // 2]:
+        prq.delete_operation(time=t)
+    deleted = time.perf_counter()
+    return inserted - start, deleted - inserted
+
+
+def benchmark_stack(n):
+
+    """
+    Inserts n retroactive push operations at random times, then deletes half of them.
+    """
+
+    times = random_times(n)
+    prs = PartiallyRetroactiveStack()
+    start = time.perf_counter()
+    for i, t in enumerate(times):
+        prs.insert_push(value=i, time=t)
+    inserted = time.perf_counter()
+    for t in times[:n // 2]:
+        prs.delete_operation(time=t)
+    deleted = time.perf_counter()
+    return inserted - start, deleted - inserted
+
+
+def benchmark_stack_worst_case(n, edits=1000):
+
+    """
+    Restores a stack from n alternating push/pop pairs, so that every pushed node is popped, then makes retroactive
+    edits before all of them: a push, a pop right after it, and the deletion of both.
+    """
+
+    operations = [(t, i % 2 == 0, i) for i, t in enumerate(range(10 * edits, 10 * edits + 20 * n, 10))]
+    prs = PartiallyRetroactiveStack.from_operations(operations)
+    start = time.perf_counter()
+    for t in range(0, 10 * edits, 10):
+        prs.insert_push(value=t, time=t)
+        prs.insert_pop(time=t + 5)
+        prs.delete_operation(time=t + 5)
+        prs.delete_operation(time=t)
+    return (time.perf_counter() - start) / edits
+
+
+def benchmark_bulk_load(n):
+
+    """
+    Restores a queue from n time-sorted operations, once with insert calls and once with from_operations.
+    """
+
+    operations = [(t, i % 4 != 3, i) for i, t in enumerate(range(10, 10 * n + 10, 10))]
+    start = time.perf_counter()
+    prq = PartiallyRetroactiveQueue()
+    for t, is_enqueue, value in operations:
+        if is_enqueue:
+            prq.insert_enqueue(value=value, time=t)
+        else:
+            prq.insert_dequeue(time=t)
+    replay_time = time.perf_counter() - start
+    del prq
+    gc.collect()
+    start = time.perf_counter()
+    PartiallyRetroactiveQueue.from_operations(operations)
+    return replay_time, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+    for n in sizes:
+        queue_insert, queue_delete = benchmark_queue(n)
+        stack_insert, stack_delete = benchmark_stack(n)
+        print(f"n={n:>9}  queue insert {queue_insert:8.3f}s delete {queue_delete:8.3f}s  "
+              f"stack insert {stack_insert:8.3f}s delete {stack_delete:8.3f}s")
+    for n in sizes:
+        edit = benchmark_stack_worst_case(n)
+        print(f"n={n:>9}  stack edit before n popped pushes {edit * 1e6:9.1f}us")
+    for n in sizes:
+        replay, bulk_load = benchmark_bulk_load(n)
+        print(f"n={n:>9}  queue restore by insert calls {replay:8.3f}s from_operations {bulk_load:8.3f}s")
@@ -0,0 +1,66 @@
+import os
+import random
+import sys
+import time
+
+from retroactive_data_structures.sharding import RetroactiveShardManager
+from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import PartiallyRetroactivePriorityQueue
+
+
+def calls(tenants, per_tenant, seed=0):
+
+    """
+    Returns per_tenant add_insert calls at random distinct times for every tenant, interleaved across tenants.
+    """
+
+    rng = random.Random(seed)
+    times = {tenant: rng.sample(range(10 * per_tenant), per_tenant) for tenant in range(tenants)}
+    return [
+        (tenant, 'add_insert', (times[tenant][index], rng.random(), None))
+        for index in range(per_tenant) for tenant in range(tenants)
+    ]
+
+
+def benchmark_in_process(all_calls):
+
+    """
+    Applies the calls to one structure per tenant in this process and returns the calls per second.
+    """
+
+    structures = {}
+    start = time.perf_counter()
+    for key, method, args in all_calls:
+        structure = structures.get(key)
+        if structure is None:
+            structure = structures[key] = PartiallyRetroactivePriorityQueue()
+        getattr(structure, method)(*args)
+    return len(all_calls) / (time.perf_counter() - start)
+
+
+def benchmark_sharded(all_calls, processes, batch_size=10000):
+
+    """
+    Applies the calls through a RetroactiveShardManager, flushing every batch_size calls, and returns the calls per
+    second, including one final read of every tenant.
+    """
+
+    with RetroactiveShardManager(PartiallyRetroactivePriorityQueue, processes) as manager:
+        start = time.perf_counter()
+        for index, (key, method, args) in enumerate(all_calls, 1):
+            manager.submit(key, method, *args)
+            if index % batch_size == 0:
+                manager.flush()
+        manager.read_many('get_min', {key for key, _, _ in all_calls})
+        return len(all_calls) / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    tenants = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    per_tenant = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    all_calls = calls(tenants, per_tenant)
+    print(f"tenants={tenants} calls={len(all_calls)} in process {benchmark_in_process(all_calls):9.0f} calls/s")
+    processes = 1
+    while processes <= max(os.cpu_count() or 1, 4):
+        print(f"tenants={tenants} calls={len(all_calls)} processes={processes} "
+              f"{benchmark_sharded(all_calls, processes):9.0f} calls/s")
+        processes *= 2
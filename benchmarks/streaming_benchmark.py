@@ -0,0 +1,61 @@
+import asyncio
+import random
+import sys
+import time
+
+from retroactive_data_structures.streaming import AsyncPriorityQueue, AsyncQueue, AsyncStack
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_queue import PartiallyRetroactiveQueue
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_stack import PartiallyRetroactiveStack
+from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import PartiallyRetroactivePriorityQueue
+
+
+async def stream(operations):
+    for operation in operations:
+        yield operation
+
+
+def benchmark_consume(front_end, operations):
+
+    """
+    Returns the number of operations per second consumed by the front-end from an async generator.
+    """
+
+    start = time.perf_counter()
+    asyncio.run(front_end.consume(stream(operations)))
+    return len(operations) / (time.perf_counter() - start)
+
+
+def operations(n, with_data=False, seed=0):
+
+    """
+    Returns n operations: a tenth are insertions backdated to a random earlier time, the rest are at increasing times
+    and a third of those are removals, made only while the structure is not empty.
+    """
+
+    rng = random.Random(seed)
+    result = []
+    size = 0
+    for index in range(n):
+        if index > 0 and rng.random() < 0.1:
+            t, is_insert = 10 * rng.randrange(index) + 5, True
+        else:
+            t, is_insert = 10 * index, size == 0 or rng.random() < 0.67
+        size += 1 if is_insert else -1
+        operation = (t, is_insert, rng.randint(0, 10 ** 6))
+        result.append(operation + (None,) if with_data else operation)
+    return list({operation[0]: operation for operation in result}.values())
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+    for batch_size in [1, 16, 256]:
+        results = [
+            ("queue", benchmark_consume(AsyncQueue(PartiallyRetroactiveQueue(), batch_size), operations(n))),
+            ("stack", benchmark_consume(AsyncStack(PartiallyRetroactiveStack(), batch_size), operations(n))),
+            ("priority queue", benchmark_consume(
+                AsyncPriorityQueue(PartiallyRetroactivePriorityQueue(), batch_size), operations(n, True)
+            )),
+        ]
+        print(f"n={n} batch_size={batch_size}  " + "  ".join(
+            f"{name} {ops_per_second:9.0f} ops/s" for name, ops_per_second in results
+        ))
@@ -0,0 +1,56 @@
+import random
+import sys
+import time
+
+from retroactive_data_structures.partially_retroactive_priority_queue.treap import Treap
+from retroactive_data_structures.partially_retroactive_priority_queue.zero_prefix_treap import ZeroPrefixTreap
+
+
+def benchmark_treap(n, seed=0):
+
+    """
+    Measures n inserts, n aggregate_before queries and n deletes on a Treap(min) with random keys.
+    """
+
+    rng = random.Random(seed)
+    keys = rng.sample(range(10 * n), n)
+    treap = Treap(min)
+    start = time.perf_counter()
+    for key in keys:
+        treap.insert(key, key)
+    inserted = time.perf_counter()
+    for key in keys:
+        treap.aggregate_before(key, include_eq=True)
+    aggregated = time.perf_counter()
+    for key in keys:
+        treap.delete(key)
+    deleted = time.perf_counter()
+    return inserted - start, aggregated - inserted, deleted - aggregated
+
+
+def benchmark_zero_prefix_treap(n, seed=0):
+
+    """
+    Measures n inserts of +1/-1 values and n zero_prefix_before queries on a ZeroPrefixTreap with random keys.
+    """
+
+    rng = random.Random(seed)
+    keys = rng.sample(range(10 * n), n)
+    treap = ZeroPrefixTreap()
+    start = time.perf_counter()
+    for key in keys:
+        treap[key] = 1 if key % 2 else -1
+    inserted = time.perf_counter()
+    for key in keys:
+        treap.zero_prefix_before(key)
+    return inserted - start, time.perf_counter() - inserted
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+    for n in sizes:
+        insert_time, aggregate_time, delete_time = benchmark_treap(n)
+        zero_prefix_insert_time, zero_prefix_time = benchmark_zero_prefix_treap(n)
+        print(f"n={n:>9}  treap insert {insert_time:8.3f}s aggregate_before {aggregate_time:8.3f}s "
+              f"delete {delete_time:8.3f}s  zero prefix insert {zero_prefix_insert_time:8.3f}s "
+              f"zero_prefix_before {zero_prefix_time:8.3f}s")
@@ -0,0 +1,69 @@
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from retroactive_data_structures.write_ahead_log import WriteAheadLog, read_operations
+from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import PartiallyRetroactivePriorityQueue
+
+
+def benchmark_logging(n, directory):
+
+    """
+    Returns the time of logging n inserts with a per-call Python logging record written to a file.
+    """
+
+    logger = logging.getLogger('retroactive_operations')
+    logger.propagate = False
+    handler = logging.FileHandler(os.path.join(directory, 'logging.log'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    start = time.perf_counter()
+    for t in range(n):
+        logger.info('add_insert %r %r %r', t, t % 1000, None)
+    elapsed = time.perf_counter() - start
+    logger.removeHandler(handler)
+    handler.close()
+    return elapsed
+
+
+def benchmark_write_ahead_log(n, path, group_size):
+
+    """
+    Returns the time of logging n inserts to a WriteAheadLog, including the final commit.
+    """
+
+    start = time.perf_counter()
+    with WriteAheadLog(path, group_size) as log:
+        for t in range(n):
+            log.log_insert(t, True, t % 1000)
+    return time.perf_counter() - start
+
+
+def benchmark_recovery(path):
+
+    """
+    Returns the time of recovering a priority queue from a log with from_log and with one add_insert per operation.
+    """
+
+    start = time.perf_counter()
+    PartiallyRetroactivePriorityQueue.from_log(path)
+    bulk_time = time.perf_counter() - start
+    start = time.perf_counter()
+    prpq = PartiallyRetroactivePriorityQueue()
+    for t, _, value, data in read_operations(path):
+        prpq.add_insert(t, value, data)
+    return bulk_time, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"n={n} logging module {benchmark_logging(n, directory):.3f}s")
+        for group_size in [1, 16, 256]:
+            operations = n // 100 if group_size == 1 else n
+            elapsed = benchmark_write_ahead_log(operations, os.path.join(directory, f'{group_size}.log'), group_size)
+            print(f"n={operations} write-ahead log group_size={group_size} {elapsed:.3f}s")
+        bulk_time, one_by_one_time = benchmark_recovery(os.path.join(directory, '256.log'))
+        print(f"n={n} recovery from_log {bulk_time:.3f}s, one add_insert per operation {one_by_one_time:.3f}s")
@@ -0,0 +1,150 @@
+import contextlib
+import threading
+
+
+class ReadWriteLock():
+    """
+    A lock that is held by any number of readers or by a single writer. Waiting writers are preferred, so a steady stream
+    of readers cannot starve the writer.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextlib.contextmanager
+    def reading(self):
+
+        """
+        Holds the lock for reading while the with block runs.
+        """
+
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def writing(self):
+
+        """
+        Holds the lock for writing while the with block runs.
+        """
+
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class ConcurrentFrontEnd():
+    """
+    A thread-safe front-end for a retroactive structure, for many reader threads and writer threads. Writes hold a
+    ReadWriteLock for writing and then publish an immutable snapshot of the present state, e.g. the first and last value
+    of a queue. Present-state reads return the published snapshot without taking any lock, so they never block on or
+    observe a write in progress. Any other read, e.g. peek_k or iteration, runs under the lock held for reading.
+    """
+
+    def __init__(self, structure):
+        self.structure = structure
+        self._lock = ReadWriteLock()
+        self._present = self._snapshot()
+
+    def _snapshot(self):
+
+        """
+        Returns the immutable present state of the structure that is published after every write.
+        """
+
+        raise NotImplementedError
+
+    def _write(self, method, *args):
+        with self._lock.writing():
+            try:
+                return method(*args)
+            finally:
+                self._present = self._snapshot()
+
+    def read(self, function):
+
+        """
+        Calls function with the structure while holding the lock for reading and returns its result, e.g.
+        front_end.read(lambda priority_queue: priority_queue.peek_k(10)). The function must not modify the structure.
+        """
+
+        with self._lock.reading():
+            return function(self.structure)
+
+    def apply_batch(self, operations):
+        return self._write(self.structure.apply_batch, operations)
+
+
+class ConcurrentQueue(ConcurrentFrontEnd):
+    def _snapshot(self):
+        return self.structure.get_first(), self.structure.get_last()
+
+    def get_first(self):
+        return self._present[0]
+
+    def get_last(self):
+        return self._present[1]
+
+    def insert_enqueue(self, value, time=None):
+        return self._write(self.structure.insert_enqueue, value, time)
+
+    def insert_dequeue(self, time=None):
+        return self._write(self.structure.insert_dequeue, time)
+
+    def delete_operation(self, time):
+        return self._write(self.structure.delete_operation, time)
+
+
+class ConcurrentStack(ConcurrentFrontEnd):
+    def _snapshot(self):
+        return self.structure.get_top()
+
+    def get_top(self):
+        return self._present
+
+    def insert_push(self, value, time=None):
+        return self._write(self.structure.insert_push, value, time)
+
+    def insert_pop(self, time=None):
+        return self._write(self.structure.insert_pop, time)
+
+    def delete_operation(self, time):
+        return self._write(self.structure.delete_operation, time)
+
+
+class ConcurrentPriorityQueue(ConcurrentFrontEnd):
+    def _snapshot(self):
+        return self.structure.get_min()
+
+    def get_min(self):
+        return self._present
+
+    def add_insert(self, time, value, data):
+        return self._write(self.structure.add_insert, time, value, data)
+
+    def add_delete_min(self, time):
+        return self._write(self.structure.add_delete_min, time)
+
+    def remove(self, time):
+        return self._write(self.structure.remove, time)
@@ -0,0 +1,294 @@
+import bisect
+import heapq
+import math
+
+from retroactive_data_structures.partially_retroactive_priority_queue.order_statistic_treap import OrderStatisticTreap
+from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import \
+    PartiallyRetroactivePriorityQueue
+from retroactive_data_structures.partially_retroactive_priority_queue.zero_prefix_treap import ZeroPrefixTreap
+
+
+class FullyRetroactivePriorityQueue():
+    """
+    The FullyRetroactivePriorityQueue class represents a fully retroactive priority queue, which allows for adding and
+    deleting elements in the past as well as querying the minimum and the contents of the priority queue at any time.
+
+    The m operations are split by time into blocks of about sqrt(m) operations. At the start of every block there is a
+    checkpoint, a persistent PartiallyRetroactivePriorityQueue holding all operations before it, whose present is the
+    state of the priority queue at that time. The checkpoints are built by applying the operations in time order to one
+    persistent queue and taking a snapshot at the start of every block, so consecutive checkpoints share all nodes except
+    the O(sqrt(m) log(m)) copied by the block between them. An update copies O(log(m)) nodes of every later checkpoint,
+    so all checkpoints are rebuilt after O(sqrt(m)) updates. A past query starts from the closest checkpoint and replays
+    the rest of its block with a binary heap. Complexity, for m operations:
+    - add_insert, add_delete_min, remove: O(sqrt(m) log(m)) amortized, since every later checkpoint is updated
+    - min_at, size_at: O(sqrt(m) log(m))
+    - contents_at: O((k + sqrt(m)) log(m)), where k is the size of the priority queue at the checkpoint
+    - memory: O(m log(m))
+    """
+
+    MIN_BLOCK_SIZE = 16
+    REBUILD_BLOCKS = 4
+
+    def __init__(self):
+
+        """
+        Initializes a new FullyRetroactivePriorityQueue instance with no operations.
+        """
+
+        self._operations = OrderStatisticTreap()
+        self._sizes = ZeroPrefixTreap()
+        self._checkpoint_times = []
+        self._checkpoints = []
+        self._block_size = self.MIN_BLOCK_SIZE
+        self._rebuild_size = 0
+        self._updates = 0
+
+    @staticmethod
+    def _apply(checkpoint, time, operation):
+
+        """
+        Applies an (is_insert, value, data) operation at the given time, which is after all operations of the checkpoint.
+        """
+
+        is_insert, value, data = operation
+        if is_insert:
+            checkpoint.add_insert(time, value, data)
+        else:
+            checkpoint.add_delete_min(time)
+
+    def _rebuild_checkpoints(self):
+
+        """
+        Places a checkpoint after every block_size operations, where block_size is about the square root of the number
+        of operations. The operations are applied in time order to one persistent queue, which is snapshotted at the start
+        of every block.
+        """
+
+        size = len(self._operations)
+        self._block_size = max(self.MIN_BLOCK_SIZE, math.isqrt(size))
+        self._rebuild_size = size
+        self._updates = 0
+        self._checkpoint_times = []
+        self._checkpoints = []
+        builder = PartiallyRetroactivePriorityQueue(persistent=True)
+        for rank, (time, operation) in enumerate(self._operations):
+            if rank > 0 and rank % self._block_size == 0:
+                self._checkpoint_times.append(time)
+                self._checkpoints.append(builder.snapshot())
+            self._apply(builder, time, operation)
+
+    def _block_range(self, index):
+
+        """
+        Returns the ranks of the first operation of the block with the given index and of the first operation after it.
+        Index -1 is the block before the first checkpoint.
+        """
+
+        start = 0 if index < 0 else self._operations.aggregate_before(self._checkpoint_times[index])
+        if index + 1 < len(self._checkpoint_times):
+            end = self._operations.aggregate_before(self._checkpoint_times[index + 1])
+        else:
+            end = len(self._operations)
+        return start, end
+
+    def _rebalance(self, time):
+
+        """
+        Rebuilds all checkpoints when the number of operations has doubled or halved since the last rebuild, or after
+        REBUILD_BLOCKS * block_size updates, which bounds the number of nodes the checkpoints no longer share. Otherwise
+        splits the block of the given time in two when it has grown to more than twice the block size, by applying its
+        first half to a snapshot of the checkpoint before it.
+        """
+
+        size = len(self._operations)
+        self._updates += 1
+        is_resized = size > 2 * self._rebuild_size or size < self._rebuild_size // 2
+        if is_resized or self._updates > self.REBUILD_BLOCKS * self._block_size:
+            self._rebuild_checkpoints()
+            return
+        index = bisect.bisect_right(self._checkpoint_times, time) - 1
+        start, end = self._block_range(index)
+        if end - start > 2 * self._block_size:
+            middle = start + (end - start) // 2
+            if index < 0:
+                checkpoint = PartiallyRetroactivePriorityQueue(persistent=True)
+            else:
+                checkpoint = self._checkpoints[index].snapshot()
+            for rank in range(start, middle):
+                node = self._operations.select(rank)
+                self._apply(checkpoint, node.key, node.value)
+            self._checkpoint_times.insert(index + 1, self._operations.select(middle).key)
+            self._checkpoints.insert(index + 1, checkpoint)
+
+    def _later_checkpoints(self, time):
+
+        """
+        Returns the checkpoints which hold an operation at the given time.
+        """
+
+        return self._checkpoints[bisect.bisect_right(self._checkpoint_times, time):]
+
+    def add_insert(self, time, value, data):
+
+        """
+        Adds an insertion operation with the given value and time to the fully retroactive priority queue.
+
+        Parameters:
+        - time: The time at which the insertion is performed.
+        - value: The value to be inserted at time time.
+        - data: The data stored with the value.
+
+        Raises:
+            KeyError: If the queue already contains an operation with time time.
+        """
+
+        if time in self._sizes:
+            raise KeyError
+        self._operations.insert(time, (True, value, data))
+        self._sizes[time] = 1
+        for checkpoint in self._later_checkpoints(time):
+            checkpoint.add_insert(time, value, data)
+        self._rebalance(time)
+
+    def add_delete_min(self, time):
+
+        """
+        Adds a delete-min operation at the given time to the fully retroactive priority queue.
+
+        Parameters:
+        - time: The time at which the delete-min is performed.
+
+        Raises:
+        - KeyError: If the queue already contains an operation with time time.
+        - ValueError: If the priority queue would be empty at this or any later delete-min.
+        """
+
+        if time in self._sizes:
+            raise KeyError
+        if self._sizes.min_prefix_sum_from(time) < 1:
+            raise ValueError
+        self._operations.insert(time, (False, None, None))
+        self._sizes[time] = -1
+        for checkpoint in self._later_checkpoints(time):
+            checkpoint.add_delete_min(time)
+        self._rebalance(time)
+
+    def remove(self, time):
+
+        """
+        Removes an operation at the given time from the fully retroactive priority queue, either an insertion or a
+        delete-min operation.
+
+        Parameters:
+        - time: The time of the operation to be removed.
+
+        Raises:
+        - KeyError: If the queue does not contain an operation with time time.
+        - ValueError: If the priority queue would be empty at a later delete-min without the removed insertion.
+        """
+
+        if time not in self._sizes:
+            raise KeyError
+        if self._sizes[time] > 0 and self._sizes.min_prefix_sum_from(time) < 1:
+            raise ValueError
+        self._operations.delete(time)
+        self._sizes.delete(time)
+        for checkpoint in self._later_checkpoints(time):
+            checkpoint.remove(time)
+        self._rebalance(time)
+
+    def _replay_block(self, time, elements):
+
+        """
+        Replays the operations between the closest checkpoint before the given time and the time itself.
+
+        Parameters:
+        - time: The time to replay up to.
+        - elements: A function returning the (value, data) elements of the checkpoint in order, given the number of
+          delete-min operations in the replayed range.
+
+        Returns:
+        - A binary heap of (value, is_replayed, order, data) tuples. Checkpoint elements come before replayed ones with
+          the same value, since they were inserted earlier.
+        """
+
+        index = bisect.bisect_right(self._checkpoint_times, time) - 1
+        start, _ = self._block_range(index)
+        end = self._operations.aggregate_before(time, include_eq=True)
+        block = [self._operations.select(rank) for rank in range(start, end)]
+        delete_count = sum(1 for node in block if not node.value[0])
+
+        base = [] if index < 0 else elements(self._checkpoints[index], delete_count)
+        heap = [(value, False, order, data) for order, (value, data) in enumerate(base)]
+        for node in block:
+            is_insert, value, data = node.value
+            if is_insert:
+                heapq.heappush(heap, (value, True, node.key, data))
+            else:
+                heapq.heappop(heap)
+        return heap
+
+    def min_at(self, time):
+
+        """
+        Returns the minimum (value, data) element of the priority queue at the given time, after the operation at that
+        time, or None if the priority queue is empty.
+
+        Only the delete_count + 1 smallest elements of the checkpoint can be the minimum, so only they are replayed.
+        """
+
+        heap = self._replay_block(time, lambda checkpoint, delete_count: checkpoint.peek_k(delete_count + 1))
+        if not heap:
+            return None
+        value, _, _, data = heap[0]
+        return value, data
+
+    def contents_at(self, time):
+
+        """
+        Returns the (value, data) elements of the priority queue at the given time, after the operation at that time,
+        ordered by value and, for equal values, by insertion time.
+        """
+
+        heap = self._replay_block(time, lambda checkpoint, delete_count: list(checkpoint))
+        return [(value, data) for value, _, _, data in sorted(heap)]
+
+    def size_at(self, time):
+
+        """
+        Returns the number of elements in the priority queue at the given time, after the operation at that time.
+        """
+
+        return self._sizes.prefix_sum(time)
+
+    def get_min(self):
+
+        """
+        Returns the minimum element in the current priority queue, or None if the priority queue is empty.
+        """
+
+        node = self._operations.find_max()
+        return None if node is None else self.min_at(node.key)
+
+    def __str__(self):
+
+        """
+        Returns a string representation of the current priority queue, in the format "PriorityQueue = [value1, value2, ...]".
+        """
+
+        node = self._operations.find_max()
+        contents = [] if node is None else self.contents_at(node.key)
+        queue = ", ".join(str(value) for value, _ in contents)
+        return f"PriorityQueue = [{queue}]"
+
+
+if __name__ == '__main__':
+    print("FULLY RETROACTIVE PRIORITY QUEUE:")
+    frpq = FullyRetroactivePriorityQueue()
+    frpq.add_insert(10, 4, '4')
+    frpq.add_insert(20, 6, '6')
+    frpq.add_insert(15, 1, '1')
+    frpq.add_delete_min(16)
+    print(frpq)
+    print("Minimum at time 15: " + str(frpq.min_at(15)))
+    print("Contents at time 17: " + str(frpq.contents_at(17)))
@@ -0,0 +1,171 @@
+from retroactive_data_structures.partially_retroactive_priority_queue.order_statistic_treap import OrderStatisticTreap
+from retroactive_data_structures.partially_retroactive_priority_queue.zero_prefix_treap import ZeroPrefixTreap
+from retroactive_data_structures.partially_retroactive_queue_and_stack.base import next_time_after
+
+
+class FullyRetroactiveQueue():
+    """
+    The FullyRetroactiveQueue class represents a fully retroactive queue, which allows for adding and deleting enqueue and
+    dequeue operations in the past as well as querying the state of the queue at any time.
+
+    Enqueue and dequeue times are kept in two order statistic treaps. At time t, the number of dequeues up to t tells how
+    many of the enqueues up to t have already left the queue, so the front is the enqueue with that rank and every query
+    takes O(log n). All operations are also kept in a ZeroPrefixTreap with weight +1 for an enqueue and -1 for a dequeue,
+    so that a change that would leave a later dequeue with an empty queue is rejected in O(log n).
+    """
+
+    def __init__(self, next_time=next_time_after):
+
+        """
+        Initializes a new FullyRetroactiveQueue instance with no operations. next_time returns the time of an
+        operation added without one, given the maximum time value or None if there are no operations.
+        """
+
+        self._enqueues = OrderStatisticTreap()
+        self._dequeues = OrderStatisticTreap()
+        self._weights = ZeroPrefixTreap()
+        self._next_time_after = next_time
+
+    def _last_time(self):
+
+        """
+        Returns the maximum time value, or None if there are no operations.
+        """
+
+        last_times = [node.key for node in (self._enqueues.find_max(), self._dequeues.find_max()) if node is not None]
+        return max(last_times) if last_times else None
+
+    def get_max_time(self):
+
+        """
+        Find maximum time value. When no time is passed to operation, the default next_time increments this value by 10.
+        """
+
+        last_time = self._last_time()
+        return 0 if last_time is None else last_time
+
+    def _next_time(self):
+
+        """
+        Returns the time of an operation added without a time value.
+        """
+
+        return self._next_time_after(self._last_time())
+
+    def _counts_at(self, time):
+
+        """
+        Returns the number of enqueues and the number of dequeues performed up to and including the given time.
+        """
+
+        return (self._enqueues.aggregate_before(time, include_eq=True),
+                self._dequeues.aggregate_before(time, include_eq=True))
+
+    def insert_enqueue(self, value, time=None):
+
+        """
+        Insert enqueue operation at specific time. If time value already exists raise ValueError.
+        """
+
+        if time is None:
+            time = self._next_time()
+
+        if time in self._weights:
+            raise ValueError
+
+        self._enqueues.insert(time, value)
+        self._weights[time] = 1
+
+    def insert_dequeue(self, time=None):
+
+        """
+        Insert dequeue operation at specific time. If time value already exists, or the queue would be empty before this
+        or any later dequeue, raise ValueError.
+        """
+
+        if time is None:
+            time = self._next_time()
+
+        if time in self._weights or self._weights.min_prefix_sum_from(time) < 1:
+            raise ValueError
+
+        self._dequeues.insert(time)
+        self._weights[time] = -1
+
+    def delete_operation(self, time):
+
+        """
+        Delete operation at specific time. If time value does not exists, or a later dequeue would be applied to an
+        empty queue without it, raise ValueError.
+        """
+
+        if time not in self._weights:
+            raise ValueError
+
+        if self._weights[time] > 0:
+            if self._weights.min_prefix_sum_from(time) < 1:
+                raise ValueError
+            self._enqueues.delete(time)
+        else:
+            self._dequeues.delete(time)
+        self._weights.delete(time)
+
+    def size_at(self, time):
+
+        """
+        Returns the number of elements in the queue at the given time, after the operation at that time.
+        """
+
+        return self._weights.prefix_sum(time)
+
+    def front_at(self, time):
+
+        """
+        Returns the first element of the queue at the given time, or None if the queue is empty at that time.
+        """
+
+        enqueued, dequeued = self._counts_at(time)
+        if enqueued <= dequeued:
+            return None
+        return self._enqueues.select(dequeued).value
+
+    def back_at(self, time):
+
+        """
+        Returns the last element of the queue at the given time, or None if the queue is empty at that time.
+        """
+
+        enqueued, dequeued = self._counts_at(time)
+        if enqueued <= dequeued:
+            return None
+        return self._enqueues.select(enqueued - 1).value
+
+    def get_first(self):
+        return self.front_at(self.get_max_time())
+
+    def get_last(self):
+        return self.back_at(self.get_max_time())
+
+    def __iter__(self):
+        dequeued = len(self._dequeues)
+        for index, (_, value) in enumerate(self._enqueues):
+            if index >= dequeued:
+                yield value
+
+    def __str__(self):
+        queue = ", ".join(str(val) for val in self)
+        return f"Queue = [{queue}]\t\t(First={self.get_first()}, Last={self.get_last()})"
+
+
+if __name__ == '__main__':
+    print("FULLY RETROACTIVE QUEUE:")
+    frq = FullyRetroactiveQueue()
+    frq.insert_enqueue(value=2, time=10)
+    frq.insert_enqueue(value=4, time=20)
+    frq.insert_enqueue(value=6, time=30)
+    frq.insert_dequeue(time=28)
+    print(frq)
+    frq.insert_enqueue(value=8, time=15)
+    print(frq)
+    print("First value at time 25: " + str(frq.front_at(25)))
+    print("Size at time 25: " + str(frq.size_at(25)))
@@ -0,0 +1,139 @@
+from retroactive_data_structures.partially_retroactive_priority_queue.zero_prefix_treap import ZeroPrefixTreap
+from retroactive_data_structures.partially_retroactive_queue_and_stack.base import next_time_after
+
+
+class FullyRetroactiveStack():
+    """
+    The FullyRetroactiveStack class represents a fully retroactive stack, which allows for adding and deleting push and
+    pop operations in the past as well as querying the state of the stack at any time.
+
+    Operations are kept in a ZeroPrefixTreap keyed by time, with weight +1 for a push and -1 for a pop, so the size of the
+    stack at time t is the prefix sum up to t. The top at time t is the push right after the last time before t whose
+    prefix sum is one less than the size at t, which is found with a single min-prefix descent in O(log n).
+    """
+
+    def __init__(self, next_time=next_time_after):
+
+        """
+        Initializes a new FullyRetroactiveStack instance with no operations. next_time returns the time of an
+        operation added without one, given the maximum time value or None if there are no operations.
+        """
+
+        self._weights = ZeroPrefixTreap()
+        self._pushed_values = {}
+        self._next_time_after = next_time
+
+    def get_max_time(self):
+
+        """
+        Find maximum time value. When no time is passed to operation, the default next_time increments this value by 10.
+        """
+
+        node = self._weights.find_max()
+        return 0 if node is None else node.key
+
+    def _next_time(self):
+
+        """
+        Returns the time of an operation added without a time value.
+        """
+
+        node = self._weights.find_max()
+        return self._next_time_after(None if node is None else node.key)
+
+    def insert_push(self, value, time=None):
+
+        """
+        Insert push operation at specific time. If time value already exists raise ValueError.
+        """
+
+        if time is None:
+            time = self._next_time()
+
+        if time in self._weights:
+            raise ValueError
+
+        self._weights[time] = 1
+        self._pushed_values[time] = value
+
+    def insert_pop(self, time=None):
+
+        """
+        Insert pop operation at specific time. If time value already exists, or the stack would be empty before this or any
+        later pop, raise ValueError.
+        """
+
+        if time is None:
+            time = self._next_time()
+
+        if time in self._weights or self._weights.min_prefix_sum_from(time) < 1:
+            raise ValueError
+
+        self._weights[time] = -1
+
+    def delete_operation(self, time):
+
+        """
+        Delete operation at specific time. If time value does not exists, or a later pop would be applied to an empty
+        stack without it, raise ValueError.
+        """
+
+        if time not in self._weights:
+            raise ValueError
+
+        if time in self._pushed_values:
+            if self._weights.min_prefix_sum_from(time) < 1:
+                raise ValueError
+            del self._pushed_values[time]
+        self._weights.delete(time)
+
+    def size_at(self, time):
+
+        """
+        Returns the number of elements on the stack at the given time, after the operation at that time.
+        """
+
+        return self._weights.prefix_sum(time)
+
+    def top_at(self, time):
+
+        """
+        Returns the top element of the stack at the given time, or None if the stack is empty at that time.
+        """
+
+        size = self._weights.prefix_sum(time)
+        if size == 0:
+            return None
+        node = self._weights.last_prefix_at_most(time, size - 1)
+        node = self._weights.find_min() if node is None else self._weights.find_after(node.key)
+        return self._pushed_values[node.key]
+
+    def get_top(self):
+        return self.top_at(self.get_max_time())
+
+    def __iter__(self):
+        stack = []
+        for time, weight in self._weights:
+            if weight > 0:
+                stack.append(self._pushed_values[time])
+            else:
+                stack.pop()
+        return reversed(stack)
+
+    def __str__(self):
+        stack = ", ".join(str(val) for val in self)
+        return f"Stack = [{stack}]\t\t(Top={self.get_top()})"
+
+
+if __name__ == '__main__':
+    print("FULLY RETROACTIVE STACK:")
+    frs = FullyRetroactiveStack()
+    frs.insert_push(value=2, time=10)
+    frs.insert_push(value=4, time=20)
+    frs.insert_push(value=6, time=30)
+    frs.insert_pop(time=28)
+    print(frs)
+    frs.insert_push(value=8, time=15)
+    print(frs)
+    print("Top value at time 25: " + str(frs.top_at(25)))
+    print("Size at time 25: " + str(frs.size_at(25)))
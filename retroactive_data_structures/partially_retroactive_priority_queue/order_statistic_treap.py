@@ -0,0 +1,110 @@
+from retroactive_data_structures.partially_retroactive_priority_queue.treap import PRIORITY_SEED, AggregateTreapNode, Treap
+
+
+class CountTreapNode(AggregateTreapNode):
+    """
+    A treap node whose aggregate value is the number of nodes in its subtree.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, key, value, priority=0.0):
+
+        """
+        Initializes a new instance of CountTreapNode, counting only itself.
+        """
+
+        super().__init__(key, value, priority)
+        self.aggregate_value = 1
+
+    def update_aggregate_value(self):
+
+        """
+        Recomputes the number of nodes in the subtree rooted at this node.
+        """
+
+        count = 1
+        if self.left is not None:
+            count += self.left.aggregate_value
+        if self.right is not None:
+            count += self.right.aggregate_value
+        self.aggregate_value = count
+
+
+class OrderStatisticTreap(Treap):
+    _node_class = CountTreapNode
+
+    def __init__(self, seed=PRIORITY_SEED):
+
+        """
+        Initializes an OrderStatisticTreap object, a Treap whose aggregate is the number of keys, which supports rank and
+        select queries in O(log n).
+
+        Parameters:
+        - seed: The seed of the random generator of node priorities.
+        """
+
+        super().__init__(lambda x, y: x + y, seed)
+
+    def aggregate_before(self, key, include_eq=False):
+
+        """
+        Counts the keys less than (or equal to) the given key.
+
+        Parameters:
+        - key: the key to count before
+        - include_eq: whether or not to count the given key
+
+        Returns:
+        - The number of keys less than (or equal to) the given key.
+        """
+
+        count = 0
+        node = self._root
+        while node is not None:
+            if node.key < key or (include_eq and node.key == key):
+                count += 1 if node.left is None else node.left.aggregate_value + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def aggregate_after(self, key, include_eq=False):
+
+        """
+        Counts the keys greater than (or equal to) the given key.
+
+        Parameters:
+        - key: the key to count after
+        - include_eq: whether or not to count the given key
+
+        Returns:
+        - The number of keys greater than (or equal to) the given key.
+        """
+
+        return self._len - self.aggregate_before(key, include_eq=not include_eq)
+
+    def select(self, index):
+
+        """
+        Finds the node with the given position in key order.
+
+        Parameters:
+        - index: the 0-based position of the node
+
+        Returns:
+        - The node at the given position, or None if there is no such position.
+        """
+
+        if index < 0 or index >= self._len:
+            return None
+        node = self._root
+        while True:
+            left_count = 0 if node.left is None else node.left.aggregate_value
+            if index < left_count:
+                node = node.left
+            elif index == left_count:
+                return node
+            else:
+                index -= left_count + 1
+                node = node.right
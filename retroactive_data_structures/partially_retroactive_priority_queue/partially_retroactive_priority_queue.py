@@ -1,5 +1,12 @@
+import heapq
+import itertools
+
+from retroactive_data_structures.partially_retroactive_priority_queue.persistent_treap import PersistentTreap, \
+    PersistentZeroPrefixTreap
 from retroactive_data_structures.partially_retroactive_priority_queue.treap import Treap
 from retroactive_data_structures.partially_retroactive_priority_queue.zero_prefix_treap import ZeroPrefixTreap
+from retroactive_data_structures.snapshot import ColumnFile, save_columns
+from retroactive_data_structures.write_ahead_log import read_operations
 
 
 class PartiallyRetroactivePriorityQueue():
@@ -7,16 +14,28 @@ class PartiallyRetroactivePriorityQueue():
     The PartiallyRetroactivePriorityQueue class represents a partially retroactive priority queue, which allows for adding and deleting elements in the past as well as querying the current minimum element.
     """
 
-    def __init__(self):
+    REBUILD_RATIO = 4
+
+    def __init__(self, persistent=False):
 
         """
         Initializes a new PartiallyRetroactivePriorityQueue instance with an empty priority queue and supporting data structures.
+
+        Parameters:
+        - persistent: If True, the supporting data structures are persistent treaps, which copy the nodes they change instead of modifying them, so snapshot takes O(1) time.
         """
 
-        self._queue_now = Treap(lambda x, y: None)
-        self._inserts = Treap(min)
-        self._deleted_inserts = Treap(max)
-        self._bridges = ZeroPrefixTreap()
+        if persistent:
+            treap_class, zero_prefix_treap_class = PersistentTreap, PersistentZeroPrefixTreap
+        else:
+            treap_class, zero_prefix_treap_class = Treap, ZeroPrefixTreap
+        self.persistent = persistent
+        self._queue_now = treap_class()
+        self._inserts = treap_class(min)
+        self._deleted_inserts = treap_class(max)
+        self._bridges = zero_prefix_treap_class()
+        self._min = None
+        self._write_ahead_log = None
 
     def _insert_for_time(self, time):
 
@@ -33,24 +52,46 @@ class PartiallyRetroactivePriorityQueue():
     def _min_for_time(self, time):
 
         """
-        Returns the value and time of the minimum element in the priority queue that was inserted after or at the given time, or None if the priority queue is empty or all elements were inserted after the given time.
+        Returns the value and time of the minimum element in the priority queue that was inserted after or at the given time. Raises ValueError if the priority queue is empty or all elements were inserted after the given time.
         """
 
         bridge = self._bridges.zero_prefix_after(time)
         if bridge is None:
             raise ValueError
-        min_value, min_time, min_data = self._inserts.aggregate_before(
-            bridge, include_eq=True
-        )
+        minimum = self._inserts.aggregate_before(bridge, include_eq=True)
+        if minimum is None:
+            raise ValueError
+        min_value, min_time, min_data = minimum
         return min_time, min_value, min_data
 
+    def _update_min(self):
+
+        """
+        Recomputes the cached minimum element of the current priority queue from the leftmost node of the queue.
+        """
+
+        node = self._queue_now.find_min()
+        self._min = None if node is None else (node.key, node.value)
+
+    def _delete_from_queue_now(self, value, time):
+
+        """
+        Deletes an element with the given value and time from the current priority queue only, and recomputes the cached minimum element if it was deleted.
+        """
+
+        self._queue_now.delete((value, time))
+        if self._min is not None and self._min[0] == (value, time):
+            self._update_min()
+
     def _promote_to_queue(self, time, value, data):
 
         """
         Promotes an element with the given value and time to the current priority queue and updates the supporting data structures accordingly.
         """
 
-        self._queue_now.insert(value, data)
+        self._queue_now.insert((value, time), data)
+        if self._min is None or (value, time) < self._min[0]:
+            self._min = ((value, time), data)
         self._inserts[time] = (value, time, data)
         self._deleted_inserts.delete(time)
         self._bridges[time] = 0
@@ -61,7 +102,7 @@ class PartiallyRetroactivePriorityQueue():
         Deletes an element with the given value and time from the current priority queue and updates the supporting data structures accordingly.
         """
 
-        self._queue_now.delete(value)
+        self._delete_from_queue_now(value, time)
         self._inserts.delete(time)
         self._deleted_inserts[time] = (value, time, data)
         self._bridges[time] = 1
@@ -83,7 +124,7 @@ class PartiallyRetroactivePriorityQueue():
         """
 
         value = self._inserts[time].value[0]
-        self._queue_now.delete(value)
+        self._delete_from_queue_now(value, time)
         self._inserts.delete(time)
         self._bridges.delete(time)
 
@@ -98,6 +139,181 @@ class PartiallyRetroactivePriorityQueue():
         self._deleted_inserts.delete(time)
         self._bridges.delete(time)
 
+    def _timeline(self):
+
+        """
+        Returns an iterator over all operations of the partially retroactive priority queue sorted by time, as (time, is_insert, value, data) tuples.
+        """
+
+        inserts = heapq.merge(self._inserts, self._deleted_inserts)
+        insert_operations = ((time, True, value, data) for time, (value, _, data) in inserts)
+        delete_operations = ((time, False, None, None) for time, op_type in self._bridges if op_type < 0)
+        return heapq.merge(insert_operations, delete_operations, key=lambda operation: operation[0])
+
+    def _rebuild(self, operations):
+
+        """
+        Replays time sorted (time, is_insert, value, data) operations with a binary heap and rebuilds all supporting data structures from the result in linear time. Nothing is modified if the replay fails.
+
+        Raises:
+        - ValueError: If a delete-min is applied to an empty priority queue.
+        """
+
+        heap = []
+        bridges = []
+        deleted_times = set()
+        deleted_inserts = []
+        for time, is_insert, value, data in operations:
+            bridges.append((time, is_insert))
+            if is_insert:
+                heapq.heappush(heap, (value, time, data))
+            elif heap:
+                deleted = heapq.heappop(heap)
+                deleted_times.add(deleted[1])
+                deleted_inserts.append(deleted)
+            else:
+                raise ValueError
+
+        inserts = sorted(heap, key=lambda insert: insert[1])
+        deleted_inserts.sort(key=lambda insert: insert[1])
+        self._queue_now.build(((value, time), data) for value, time, data in sorted(heap))
+        self._inserts.build((insert[1], insert) for insert in inserts)
+        self._deleted_inserts.build((insert[1], insert) for insert in deleted_inserts)
+        self._bridges.build(
+            (time, (1 if time in deleted_times else 0) if is_insert else -1) for time, is_insert in bridges
+        )
+        self._update_min()
+
+    def snapshot(self):
+
+        """
+        Returns an independent copy of the partially retroactive priority queue. For a persistent queue the copy shares all nodes with this queue and is made in O(1) time; otherwise the timeline is replayed into a new queue in linear time.
+        """
+
+        if not self.persistent:
+            instance = type(self)()
+            instance._rebuild(self._timeline())
+            return instance
+        instance = type(self).__new__(type(self))
+        instance.persistent = True
+        instance._queue_now = self._queue_now.snapshot()
+        instance._inserts = self._inserts.snapshot()
+        instance._deleted_inserts = self._deleted_inserts.snapshot()
+        instance._bridges = self._bridges.snapshot()
+        instance._min = self._min
+        instance._write_ahead_log = None
+        return instance
+
+    def save(self, path):
+
+        """
+        Writes all operations to a file in the compact columnar binary layout of save_columns: the time and type of every
+        operation, and the value and data of every insertion.
+
+        Parameters:
+        - path: The path of the file to write.
+        """
+
+        times, is_inserts, values, data_column = [], [], [], []
+        for time, is_insert, value, data in self._timeline():
+            times.append(time)
+            is_inserts.append(is_insert)
+            if is_insert:
+                values.append(value)
+                data_column.append(data)
+        save_columns(path, [times, is_inserts, values, data_column])
+
+    @classmethod
+    def load(cls, path):
+
+        """
+        Builds a new partially retroactive priority queue from a file written by save. The file is memory-mapped and its
+        operations are replayed once into the linear time rebuild.
+
+        Parameters:
+        - path: The path of the file to read.
+        """
+
+        instance = cls()
+        with ColumnFile(path) as column_file:
+            values = iter(column_file.column(2))
+            data_column = iter(column_file.column(3))
+            instance._rebuild(
+                (time, True, next(values), next(data_column)) if is_insert else (time, False, None, None)
+                for time, is_insert in zip(column_file.column(0), column_file.column(1))
+            )
+        return instance
+
+    @classmethod
+    def from_log(cls, path):
+
+        """
+        Builds a new partially retroactive priority queue from a write-ahead log. The operations that were not removed afterwards are replayed once into the linear time rebuild.
+
+        Parameters:
+        - path: The path of the log file.
+        """
+
+        instance = cls()
+        instance._rebuild(read_operations(path))
+        return instance
+
+    def log_to(self, write_ahead_log):
+
+        """
+        Logs every operation that is added or removed from now on to the given WriteAheadLog.
+
+        Parameters:
+        - write_ahead_log: The WriteAheadLog to append to, or None to stop logging.
+        """
+
+        self._write_ahead_log = write_ahead_log
+
+    def apply_batch(self, operations):
+
+        """
+        Adds a batch of operations to the partially retroactive priority queue, in any order.
+
+        Small batches are applied one operation at a time. When the batch has at least 1/REBUILD_RATIO as many operations as the queue already holds, the whole timeline is replayed once and the supporting data structures are rebuilt in linear time instead. If the batch fails, the queue is left unchanged and nothing is logged.
+
+        Parameters:
+        - operations: An iterable of (time, is_insert, value, data) tuples. For a delete-min is_insert is False and value and data are ignored.
+
+        Raises:
+        - KeyError: If the queue already contains an operation with one of the times, or a time appears twice in the batch.
+        - ValueError: If a delete-min would be applied to an empty priority queue.
+        """
+
+        operations = sorted(operations, key=lambda operation: operation[0])
+        for index, operation in enumerate(operations):
+            time = operation[0]
+            if time in self._bridges or (index > 0 and operations[index - 1][0] == time):
+                raise KeyError
+        if len(operations) * self.REBUILD_RATIO < len(self._bridges):
+            write_ahead_log, self._write_ahead_log = self._write_ahead_log, None
+            applied_times = []
+            try:
+                for time, is_insert, value, data in operations:
+                    if is_insert:
+                        self.add_insert(time, value, data)
+                    else:
+                        self.add_delete_min(time)
+                    applied_times.append(time)
+            except ValueError:
+                for time in reversed(applied_times):
+                    self.remove(time)
+                raise
+            finally:
+                self._write_ahead_log = write_ahead_log
+        else:
+            self._rebuild(heapq.merge(self._timeline(), operations, key=lambda operation: operation[0]))
+        if self._write_ahead_log is not None:
+            for time, is_insert, value, data in operations:
+                if is_insert:
+                    self._write_ahead_log.log_insert(time, True, value, data)
+                else:
+                    self._write_ahead_log.log_insert(time, False)
+
     def add_insert(self, time, value, data):
 
         """
@@ -117,6 +333,8 @@ class PartiallyRetroactivePriorityQueue():
         self._bridges[time] = 1
         insert_time, insert_value, insert_data = self._insert_for_time(time)
         self._promote_to_queue(insert_time, insert_value, insert_data)
+        if self._write_ahead_log is not None:
+            self._write_ahead_log.log_insert(time, True, value, data)
 
     def add_delete_min(self, time):
 
@@ -128,6 +346,7 @@ class PartiallyRetroactivePriorityQueue():
 
         Raises:
         - KeyError: If the queue already contains an operation with time time.
+        - ValueError: If the priority queue is empty at time time.
 
         """
         if time in self._bridges:
@@ -135,6 +354,8 @@ class PartiallyRetroactivePriorityQueue():
         delete_time, delete_value, delete_data = self._min_for_time(time)
         self._bridges[time] = -1
         self._delete_from_queue(delete_time, delete_value, delete_data)
+        if self._write_ahead_log is not None:
+            self._write_ahead_log.log_insert(time, False)
 
     def remove(self, time):
 
@@ -157,25 +378,39 @@ class PartiallyRetroactivePriorityQueue():
             self._remove_insert_in_queue(time)
         else:
             self._remove_deleted_insert(time)
+        if self._write_ahead_log is not None:
+            self._write_ahead_log.log_delete(time)
 
     def get_min(self):
 
         """
-        Returns the minimum element in the current priority queue, or None if the priority queue is empty.
+        Returns the minimum element in the current priority queue, or None if the priority queue is empty. The minimum is cached and kept up to date by every change to the current priority queue.
         """
 
-        try:
-            return self.__iter__().__next__()
-        except StopIteration:
+        if self._min is None:
             return None
+        (value, _), data = self._min
+        return value, data
+
+    def peek_k(self, k):
+
+        """
+        Returns the k smallest elements in the current priority queue, in the same order as iteration. Only the first k elements are visited.
+
+        Parameters:
+        - k: The number of elements to return.
+        """
+
+        return list(itertools.islice(self, k))
 
     def __iter__(self):
 
         """
-        Returns an iterator over the elements in the current priority queue.
+        Returns an iterator over the (value, data) elements in the current priority queue, ordered by value and, for equal values, by insertion time.
         """
 
-        yield from self._queue_now
+        for (value, _), data in self._queue_now:
+            yield value, data
 
     def __len__(self):
 
@@ -191,7 +426,8 @@ class PartiallyRetroactivePriorityQueue():
         Returns True if the given value is in the current priority queue, False otherwise.
         """
 
-        return value in self._queue_now
+        node = self._queue_now.find_after((value,))
+        return node is not None and node.key[0] == value
 
     def __str__(self):
 
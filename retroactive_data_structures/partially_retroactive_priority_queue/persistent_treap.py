@@ -0,0 +1,214 @@
+import copy
+
+from retroactive_data_structures.partially_retroactive_priority_queue.treap import Treap
+from retroactive_data_structures.partially_retroactive_priority_queue.zero_prefix_treap import ZeroPrefixTreap
+
+OWNED_NODE_CLASSES = {}
+
+
+def owned_node_class(node_class):
+
+    """
+    Returns a subclass of the given node class with an owner slot, which tells the persistent treap that created the node.
+    The subclass is made once per node class.
+    """
+
+    owned_class = OWNED_NODE_CLASSES.get(node_class)
+    if owned_class is None:
+        owned_class = type(node_class.__name__, (node_class,), {'__slots__': ('owner',)})
+        OWNED_NODE_CLASSES[node_class] = owned_class
+    return owned_class
+
+
+class PersistentTreapMixin:
+    """
+    Makes a Treap persistent: insert and delete never modify a node shared with another version, but copy the nodes on
+    the search path and the split or merge path, and share all other nodes with earlier versions. Every update allocates
+    O(log(n)) nodes in expectation, and snapshot returns an independent copy of the treap in O(1).
+
+    Every node remembers the treap version that created it. Nodes created since the last snapshot are not shared yet, so
+    they are modified in place instead of being copied again.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._node_class = owned_node_class(self._node_class)
+        self._owner = object()
+
+    def snapshot(self):
+
+        """
+        Returns a copy of the treap that shares all nodes with this treap. Later updates of either treap do not affect
+        the other one.
+        """
+
+        treap = copy.copy(self)
+        treap._owner = object()
+        self._owner = object()
+        return treap
+
+    def build(self, items):
+
+        """
+        Replaces the contents of the treap with the given (key, value) pairs in linear time. The new nodes are not shared
+        yet, so they are owned by this treap.
+        """
+
+        super().build(items)
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is not None:
+                node.owner = self._owner
+                stack.append(node.left)
+                stack.append(node.right)
+
+    def _copy(self, node):
+
+        """
+        Returns a node with the key, value, priority and children of the given node that this treap may modify: the node
+        itself if this treap created it since the last snapshot, and a new node otherwise. The aggregate value of the
+        result must be updated once its children are final.
+        """
+
+        if node.owner is self._owner:
+            return node
+        node_copy = self._node_class(node.key, node.value, node.priority)
+        node_copy.owner = self._owner
+        node_copy.left = node.left
+        node_copy.right = node.right
+        return node_copy
+
+    def _copy_path(self, path, subtree):
+
+        """
+        Copies the nodes of a search path bottom-up, replacing the child below the last node with the given subtree.
+
+        Parameters:
+        - path: A list of (node, is_left) pairs from the root down, where is_left tells which child the path follows.
+        - subtree: The new subtree below the last node of the path.
+
+        Returns:
+        - The new root.
+        """
+
+        for node, is_left in reversed(path):
+            node_copy = self._copy(node)
+            if is_left:
+                node_copy.left = subtree
+            else:
+                node_copy.right = subtree
+            node_copy.update_aggregate_value()
+            subtree = node_copy
+        return subtree
+
+    def _split(self, node, key):
+
+        """
+        Splits the subtree into the copies of the nodes with keys less than the key and greater than the key. The key must
+        not be in the subtree.
+        """
+
+        left_root = right_root = None
+        left_tail = right_tail = None
+        copies = []
+        while node is not None:
+            node_copy = self._copy(node)
+            copies.append(node_copy)
+            if node_copy.key < key:
+                if left_tail is None:
+                    left_root = node_copy
+                else:
+                    left_tail.right = node_copy
+                left_tail = node_copy
+                node = node_copy.right
+            else:
+                if right_tail is None:
+                    right_root = node_copy
+                else:
+                    right_tail.left = node_copy
+                right_tail = node_copy
+                node = node_copy.left
+        if left_tail is not None:
+            left_tail.right = None
+        if right_tail is not None:
+            right_tail.left = None
+        for node_copy in reversed(copies):
+            node_copy.update_aggregate_value()
+        return left_root, right_root
+
+    def _merge(self, left, right):
+
+        """
+        Merges two subtrees, where all keys of the left one are less than the keys of the right one, copying the nodes on
+        the merge path.
+        """
+
+        path = []
+        while left is not None and right is not None:
+            if left.priority > right.priority:
+                path.append((left, False))
+                left = left.right
+            else:
+                path.append((right, True))
+                right = right.left
+        return self._copy_path(path, left if left is not None else right)
+
+    def _insert(self, node, key, value=None):
+
+        """
+        Inserts a node with a key and value into the subtree, or replaces the value of the key, without modifying any
+        shared node. Returns the new root.
+        """
+
+        new_node = self._node_class(key, value, self._random())
+        new_node.owner = self._owner
+        path = []
+        found = False
+        while node is not None and node.priority > new_node.priority:
+            if node.key == key:
+                found = True
+                break
+            is_left = key < node.key
+            path.append((node, is_left))
+            node = node.left if is_left else node.right
+        if not found and self._find(node, key) is not None:
+            while node.key != key:
+                is_left = key < node.key
+                path.append((node, is_left))
+                node = node.left if is_left else node.right
+            found = True
+        if found:
+            new_node.priority = node.priority
+            new_node.left = node.left
+            new_node.right = node.right
+        else:
+            new_node.left, new_node.right = self._split(node, key)
+            self._len += 1
+        new_node.update_aggregate_value()
+        return self._copy_path(path, new_node)
+
+    def _delete(self, node, key):
+
+        """
+        Deletes the node with a key from the subtree without modifying any shared node. Returns the new root.
+        """
+
+        root = node
+        path = []
+        while node is not None and node.key != key:
+            is_left = key < node.key
+            path.append((node, is_left))
+            node = node.left if is_left else node.right
+        if node is None:
+            return root
+        self._len -= 1
+        return self._copy_path(path, self._merge(node.left, node.right))
+
+
+class PersistentTreap(PersistentTreapMixin, Treap):
+    pass
+
+
+class PersistentZeroPrefixTreap(PersistentTreapMixin, ZeroPrefixTreap):
+    pass
@@ -1,10 +1,20 @@
+import operator
 import random
 
-random.seed(1)
+PRIORITY_SEED = 1
 
 
 class TreapNode:
-    def __init__(self, key, value, aggregate_func):
+    """
+    A treap node without an aggregate value. Subclasses of AggregateTreapNode keep the aggregate of their subtree.
+    """
+
+    __slots__ = ('key', 'value', 'priority', 'left', 'right')
+
+    aggregate_value = None
+    is_aggregated = False
+
+    def __init__(self, key, value, priority=0.0):
 
         """
         Initialize a new instance of TreapNode.
@@ -12,14 +22,12 @@ class TreapNode:
         Parameters:
         - key: The key of the node.
         - value: The value of the node.
-        - aggregate_func: A function used to aggregate the values of nodes.
+        - priority: The heap priority of the node. A Treap draws it from its own random generator.
         """
 
         self.key = key
         self.value = value
-        self.priority = random.random()
-        self.aggregate_func = aggregate_func
-        self.aggregate_value = value
+        self.priority = priority
         self.left = None
         self.right = None
 
@@ -36,8 +44,6 @@ class TreapNode:
         second_node = first_node.right
         first_node.right = second_node.left
         second_node.left = first_node
-        first_node.update_aggregate_value()
-        second_node.update_aggregate_value()
         return second_node
 
     def right_rotate(self):
@@ -53,8 +59,6 @@ class TreapNode:
         second_node = first_node.left
         first_node.left = second_node.right
         second_node.right = first_node
-        first_node.update_aggregate_value()
-        second_node.update_aggregate_value()
         return second_node
 
     def split(self, key, eq_left=False):
@@ -70,17 +74,33 @@ class TreapNode:
         - A tuple of two TreapNodes representing the split subtrees.
         """
 
-        root = self
-        if root.key < key or (root.key == key and eq_left):
-            split_left, split_right = (None, None) if root.right is None else root.right.split(key, eq_left)
-            root.right = split_left
-            root.update_aggregate_value()
-            return root, split_right
-        else:
-            split_left, split_right = (None, None) if root.left is None else self.left.split(key, eq_left)
-            root.left = split_right
-            root.update_aggregate_value()
-            return split_left, root
+        left_root = right_root = None
+        left_tail = right_tail = None
+        path = []
+        node = self
+        while node is not None:
+            path.append(node)
+            if node.key < key or (node.key == key and eq_left):
+                if left_tail is None:
+                    left_root = node
+                else:
+                    left_tail.right = node
+                left_tail = node
+                node = node.right
+            else:
+                if right_tail is None:
+                    right_root = node
+                else:
+                    right_tail.left = node
+                right_tail = node
+                node = node.left
+        if left_tail is not None:
+            left_tail.right = None
+        if right_tail is not None:
+            right_tail.left = None
+        for node in reversed(path):
+            node.update_aggregate_value()
+        return left_root, right_root
 
     def merge(self, right_tree):
 
@@ -94,37 +114,31 @@ class TreapNode:
         - The new root of the merged subtree.
         """
 
-        if right_tree is None:
-            return self
-        elif self is None:
-            return right_tree
-        elif self.priority < right_tree.priority:
-            self.right = right_tree if self.right is None else self.right.merge(right_tree)
-            self.update_aggregate_value()
-            return self
-        else:
-            right_tree.left = self.merge(right_tree.left)
-            right_tree.update_aggregate_value()
-            return right_tree
+        left, right = self, right_tree
+        path = []
+        while left is not None and right is not None:
+            if left.priority > right.priority:
+                path.append((left, True))
+                left = left.right
+            else:
+                path.append((right, False))
+                right = right.left
+        subtree = left if left is not None else right
+        for node, is_left_tree in reversed(path):
+            if is_left_tree:
+                node.right = subtree
+            else:
+                node.left = subtree
+            node.update_aggregate_value()
+            subtree = node
+        return subtree
 
     def update_aggregate_value(self):
 
         """
-        Update the aggregate value of this node and its children.
+        Update the aggregate value of this node from its value and its children. A TreapNode has no aggregate value.
         """
 
-        self.aggregate_value = self.value
-        result = None
-        for node in [self.left, self, self.right]:
-            if node is None:
-                continue
-            elif result is None:
-                result = node.aggregate_value
-            else:
-                result = self.aggregate_func(result, node.aggregate_value)
-        self.aggregate_value = result
-
-
     def __iter__(self):
 
         """
@@ -134,11 +148,15 @@ class TreapNode:
         - A tuple containing the key and value of each node visited.
         """
 
-        if self.left is not None:
-            yield from self.left
-        yield self.key, self.value
-        if self.right is not None:
-            yield from self.right
+        stack = []
+        node = self
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key, node.value
+            node = node.right
 
     def __str__(self, prefix=""):
 
@@ -164,17 +182,189 @@ class TreapNode:
         return res
 
 
+class AggregateTreapNode(TreapNode):
+    """
+    A treap node that keeps the aggregate value of its subtree, which rotations update.
+    """
+
+    __slots__ = ('aggregate_value',)
+
+    is_aggregated = True
+
+    def __init__(self, key, value, priority=0.0):
+        super().__init__(key, value, priority)
+        self.aggregate_value = value
+
+    def left_rotate(self):
+
+        """
+        Perform a left rotation on the node and update the aggregate values of both rotated nodes.
+
+        Returns:
+        - The new root of the rotated subtree.
+        """
+
+        first_node = self
+        second_node = first_node.right
+        first_node.right = second_node.left
+        second_node.left = first_node
+        first_node.update_aggregate_value()
+        second_node.update_aggregate_value()
+        return second_node
+
+    def right_rotate(self):
+
+        """
+        Perform a right rotation on the node and update the aggregate values of both rotated nodes.
+
+        Returns:
+        - The new root of the rotated subtree.
+        """
+
+        first_node = self
+        second_node = first_node.left
+        first_node.left = second_node.right
+        second_node.right = first_node
+        first_node.update_aggregate_value()
+        second_node.update_aggregate_value()
+        return second_node
+
+
+class FunctionTreapNode(AggregateTreapNode):
+    """
+    A treap node that aggregates values with the aggregate_func of its class, where None values are skipped. Treap makes
+    a subclass for every aggregate function without a specialized node class.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def aggregate_func(left, right):
+        raise NotImplementedError
+
+    def update_aggregate_value(self):
+
+        """
+        Update the aggregate value of this node from its value and its children.
+        """
+
+        result = self.value
+        if self.left is not None:
+            left_value = self.left.aggregate_value
+            if left_value is not None:
+                result = left_value if result is None else self.aggregate_func(left_value, result)
+        if self.right is not None:
+            right_value = self.right.aggregate_value
+            if right_value is not None:
+                result = right_value if result is None else self.aggregate_func(result, right_value)
+        self.aggregate_value = result
+
+
+class MinTreapNode(AggregateTreapNode):
+    """
+    A treap node whose aggregate value is the minimum value of its subtree, the same as FunctionTreapNode with min.
+    """
+
+    __slots__ = ()
+
+    def update_aggregate_value(self):
+        result = self.value
+        if self.left is not None:
+            left_value = self.left.aggregate_value
+            if left_value is not None and (result is None or not result < left_value):
+                result = left_value
+        if self.right is not None:
+            right_value = self.right.aggregate_value
+            if right_value is not None and (result is None or right_value < result):
+                result = right_value
+        self.aggregate_value = result
+
+
+class MaxTreapNode(AggregateTreapNode):
+    """
+    A treap node whose aggregate value is the maximum value of its subtree, the same as FunctionTreapNode with max.
+    """
+
+    __slots__ = ()
+
+    def update_aggregate_value(self):
+        result = self.value
+        if self.left is not None:
+            left_value = self.left.aggregate_value
+            if left_value is not None and (result is None or not result > left_value):
+                result = left_value
+        if self.right is not None:
+            right_value = self.right.aggregate_value
+            if right_value is not None and (result is None or right_value > result):
+                result = right_value
+        self.aggregate_value = result
+
+
+class SumTreapNode(AggregateTreapNode):
+    """
+    A treap node whose aggregate value is the sum of the values of its subtree, the same as FunctionTreapNode with
+    operator.add.
+    """
+
+    __slots__ = ()
+
+    def update_aggregate_value(self):
+        result = self.value
+        if self.left is not None:
+            left_value = self.left.aggregate_value
+            if left_value is not None:
+                result = left_value if result is None else left_value + result
+        if self.right is not None:
+            right_value = self.right.aggregate_value
+            if right_value is not None:
+                result = right_value if result is None else result + right_value
+        self.aggregate_value = result
+
+
+AGGREGATE_NODE_CLASSES = {None: TreapNode, min: MinTreapNode, max: MaxTreapNode, operator.add: SumTreapNode}
+FUNCTION_NODE_CLASSES = {}
+
+
+def node_class_for(aggregate_func):
+
+    """
+    Returns the node class for a Treap with the given aggregate function: a specialized class for None (no aggregation),
+    min, max and operator.add, and a FunctionTreapNode subclass for any other function. The subclass is made once per
+    function, so Treaps with the same function share it.
+    """
+
+    node_class = AGGREGATE_NODE_CLASSES.get(aggregate_func)
+    if node_class is None:
+        node_class = FUNCTION_NODE_CLASSES.get(aggregate_func)
+    if node_class is None:
+        node_class = type(
+            'FunctionTreapNode', (FunctionTreapNode,), {'__slots__': (), 'aggregate_func': staticmethod(aggregate_func)}
+        )
+        FUNCTION_NODE_CLASSES[aggregate_func] = node_class
+    return node_class
+
+
 class Treap:
-    def __init__(self, aggregate_func):
+    _node_class = None
+
+    def __init__(self, aggregate_func=None, seed=PRIORITY_SEED):
 
         """
         Initialize a new instance of Treap.
 
         Parameters:
-        - aggregate_func: A function used to aggregate the values of nodes.
+        - aggregate_func: A function used to aggregate the values of nodes, or None if the Treap does not aggregate values.
+          Unless a subclass sets its own _node_class, the node class is picked by node_class_for, so nodes do not store
+          the function and a Treap without aggregation does not update aggregates at all.
+        - seed: The seed of the random generator of node priorities. Every Treap has its own generator, so its shape only
+          depends on the seed and the operations applied to it. Pass None to seed it from the operating system.
         """
 
         self._aggregate_func = aggregate_func
+        if self._node_class is None:
+            self._node_class = node_class_for(aggregate_func)
+        self._is_aggregated = self._node_class.is_aggregated
+        self._random = random.Random(seed).random
         self._root = None
         self._len = 0
 
@@ -192,21 +382,51 @@ class Treap:
         - The new node of the modified subtree.
         """
 
-        if node is None:
-            node = TreapNode(key, value, self._aggregate_func)
+        path = []
+        while node is not None and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        if node is not None:
+            node.value = value
+            if self._is_aggregated:
+                node.update_aggregate_value()
+        else:
+            node = self._node_class(key, value, self._random())
             self._len += 1
-            return node
-        if key < node.key:
-            node.left = self._insert(node.left, key, value)
-            if node.left.priority > node.priority:
-                node = node.right_rotate()
-        elif key > node.key:
-            node.right = self._insert(node.right, key, value)
-            if node.right.priority > node.priority:
-                node = node.left_rotate()
+            if path:
+                self._replace_child(path[-1], None, node, key < path[-1].key)
+            while path and path[-1].priority < node.priority:
+                parent = path.pop()
+                if parent.left is node:
+                    parent.right_rotate()
+                else:
+                    parent.left_rotate()
+                if path:
+                    self._replace_child(path[-1], parent, node)
+        if self._is_aggregated:
+            for ancestor in reversed(path):
+                ancestor.update_aggregate_value()
+        return path[0] if path else node
+
+    @staticmethod
+    def _replace_child(parent, child, new_child, is_left=None):
+
+        """
+        Replace a child of `parent` with `new_child`.
+
+        Parameters:
+        - parent: The node whose child is replaced.
+        - child: The child to replace.
+        - new_child: The node to put in place of `child`.
+        - is_left: Which side to replace, if it cannot be told by comparing with `child`.
+        """
+
+        if is_left is None:
+            is_left = parent.left is child
+        if is_left:
+            parent.left = new_child
         else:
-            node.value = value
-        return node
+            parent.right = new_child
 
     def insert(self, key, value=None):
 
@@ -220,6 +440,45 @@ class Treap:
 
         self._root = self._insert(self._root, key, value)
 
+    def build(self, items):
+
+        """
+        Replace the contents of the Treap with the given (key, value) pairs in linear time.
+
+        Parameters:
+        - items: An iterable of (key, value) pairs sorted by key in strictly increasing order.
+        """
+
+        right_spine = []
+        length = 0
+        next_priority = self._random
+        for key, value in items:
+            node = self._node_class(key, value, next_priority())
+            last_popped = None
+            while right_spine and right_spine[-1].priority < node.priority:
+                last_popped = right_spine.pop()
+            node.left = last_popped
+            if right_spine:
+                right_spine[-1].right = node
+            right_spine.append(node)
+            length += 1
+        self._root = right_spine[0] if right_spine else None
+        self._len = length
+        if not self._is_aggregated:
+            return
+
+        level_order = [] if self._root is None else [self._root]
+        index = 0
+        while index < len(level_order):
+            node = level_order[index]
+            if node.left is not None:
+                level_order.append(node.left)
+            if node.right is not None:
+                level_order.append(node.right)
+            index += 1
+        for node in reversed(level_order):
+            node.update_aggregate_value()
+
     def _delete(self, node, key):
 
         """
@@ -230,30 +489,28 @@ class Treap:
         - key: The key of the node to delete.
         """
 
+        path = []
+        while node is not None and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
         if node is None:
-            return False
-        if node.key == key:
-            if node.left is None and node.right is None:
-                self._len -= 1
-                return None
-            elif node.left is None:
-                self._len -= 1
-                return node.right
-            elif node.right is None:
-                self._len -= 1
-                return node.left
+            return path[0] if path else None
+        while node.left is not None and node.right is not None:
+            if node.left.priority > node.right.priority:
+                child = node.right_rotate()
             else:
-                if node.left.priority < node.right.priority:
-                    node = node.right_rotate()
-                    node.right = self._delete(node.right, key)
-                else:
-                    node = node.left_rotate()
-                    node.left = self._delete(node.left, key)
-        elif key < node.key:
-            node.left = self._delete(node.left, key)
-        else:
-            node.right = self._delete(node.right, key)
-        return node
+                child = node.left_rotate()
+            if path:
+                self._replace_child(path[-1], node, child)
+            path.append(child)
+        replacement = node.left if node.left is not None else node.right
+        if path:
+            self._replace_child(path[-1], node, replacement)
+        self._len -= 1
+        if self._is_aggregated:
+            for ancestor in reversed(path):
+                ancestor.update_aggregate_value()
+        return path[0] if path else replacement
 
     def delete(self, key):
 
@@ -274,7 +531,7 @@ class Treap:
     def _find(self, node, key):
 
         """
-        Recursively searches the tree rooted at the given node to find a node with the specified key.
+        Searches the tree rooted at the given node to find a node with the specified key.
 
         Parameters:
         - node: The root node of the tree to search.
@@ -287,14 +544,9 @@ class Treap:
         - KeyError if the key is not found in the Treap.
         """
 
-        if node == None:
-            return None
-        if node.key == key:
-            return node
-        if key < node.key:
-            return self._find(node.left, key)
-        else:
-            return self._find(node.right, key)
+        while node is not None and node.key != key:
+            node = node.left if key < node.key else node.right
+        return node
 
     def find(self, key):
 
@@ -313,10 +565,87 @@ class Treap:
 
         return self._find(self._root, key)
 
+    def find_after(self, key):
+
+        """
+        Finds the node with the smallest key strictly greater than the given key.
+
+        Parameters:
+        - key: the key to search after
+
+        Returns:
+        - The node with the smallest key greater than `key`, or `None` if no such node exists.
+        """
+
+        node = self._root
+        result = None
+        while node is not None:
+            if key < node.key:
+                result = node
+                node = node.left
+            else:
+                node = node.right
+        return result
+
+    def find_before(self, key):
+
+        """
+        Finds the node with the largest key strictly less than the given key.
+
+        Parameters:
+        - key: the key to search before
+
+        Returns:
+        - The node with the largest key less than `key`, or `None` if no such node exists.
+        """
+
+        node = self._root
+        result = None
+        while node is not None:
+            if node.key < key:
+                result = node
+                node = node.right
+            else:
+                node = node.left
+        return result
+
+    def find_min(self):
+
+        """
+        Finds the node with the smallest key in the Treap.
+
+        Returns:
+        - The node with the smallest key, or `None` if the Treap is empty.
+        """
+
+        node = self._root
+        if node is None:
+            return None
+        while node.left is not None:
+            node = node.left
+        return node
+
+    def find_max(self):
+
+        """
+        Finds the node with the largest key in the Treap.
+
+        Returns:
+        - The node with the largest key, or `None` if the Treap is empty.
+        """
+
+        node = self._root
+        if node is None:
+            return None
+        while node.right is not None:
+            node = node.right
+        return node
+
     def aggregate_before(self, key, include_eq=False):
 
         """
-        Aggregates the values of all nodes with keys less than or equal to the given key.
+        Aggregates the values of all nodes with keys less than (or equal to) the given key.
+        The Treap is not modified: the aggregated values stored in the subtrees left of the search path are combined.
 
         Parameters:
         - key: the key to aggregate before
@@ -327,15 +656,23 @@ class Treap:
 
         """
 
-        before, after = (None, None) if self._root is None else self._root.split(key, eq_left=include_eq)
-        result = before.aggregate_value if before is not None else None
-        self._root = after if before is None else before.merge(after)
+        result = None
+        node = self._root
+        while node is not None:
+            if node.key < key or (include_eq and node.key == key):
+                if node.left is not None:
+                    result = self._combine(result, node.left.aggregate_value)
+                result = self._combine(result, node.value)
+                node = node.right
+            else:
+                node = node.left
         return result
 
     def aggregate_after(self, key, include_eq=False):
 
         """
-        Aggregates the values of all nodes with keys greater than or equal to the given key.
+        Aggregates the values of all nodes with keys greater than (or equal to) the given key.
+        The Treap is not modified: the aggregated values stored in the subtrees right of the search path are combined.
 
         Parameters:
         - key: the key to aggregate after
@@ -346,11 +683,40 @@ class Treap:
 
         """
 
-        before, after = (None, None) if self._root is None else self._root.split(key, eq_left=not include_eq)
-        result = after.aggregate_value if after is not None else None
-        self._root = after if before is None else before.merge(after)
+        result = None
+        node = self._root
+        while node is not None:
+            if key < node.key or (include_eq and node.key == key):
+                if node.right is not None:
+                    result = self._combine(node.right.aggregate_value, result)
+                result = self._combine(node.value, result)
+                node = node.left
+            else:
+                node = node.right
         return result
 
+    def _combine(self, left, right):
+
+        """
+        Combines two aggregated values in key order, where `None` stands for an empty range. A Treap without aggregation
+        always returns `None`.
+
+        Parameters:
+        - left: the aggregated value of the range with smaller keys
+        - right: the aggregated value of the range with larger keys
+
+        Returns:
+        - The aggregated value of both ranges.
+        """
+
+        if self._aggregate_func is None:
+            return None
+        if left is None:
+            return right
+        if right is None:
+            return left
+        return self._aggregate_func(left, right)
+
     def aggregate(self):
 
         """
@@ -391,13 +757,7 @@ class Treap:
         - True if the key is in the Treap, False otherwise.
         """
 
-        try:
-            self.__getitem__(key)
-            return True
-        except KeyError:
-            return False
-        except AttributeError:
-            return False
+        return self.find(key) is not None
 
     def __setitem__(self, key, value):
 
@@ -1,4 +1,4 @@
-from retroactive_data_structures.partially_retroactive_priority_queue.treap import Treap
+from retroactive_data_structures.partially_retroactive_priority_queue.treap import PRIORITY_SEED, AggregateTreapNode, Treap
 
 
 class MinPrefixSumAggregator:
@@ -14,6 +14,8 @@ class MinPrefixSumAggregator:
     - min_prefix_last_key: The last key in the range that results in the minimum prefix sum.
     """
 
+    __slots__ = ('sum', 'min_key', 'max_key', 'min_prefix_sum', 'min_prefix_first_key', 'min_prefix_last_key')
+
     def __init__(self, key, value):
 
         """
@@ -31,6 +33,41 @@ class MinPrefixSumAggregator:
         self.min_prefix_first_key = key
         self.min_prefix_last_key = key
 
+    def assign(self, other):
+
+        """
+        Copies all fields of another instance into this instance.
+
+        Args:
+        - other (MinPrefixSumAggregator): The instance to copy.
+        """
+
+        self.sum = other.sum
+        self.min_key = other.min_key
+        self.max_key = other.max_key
+        self.min_prefix_sum = other.min_prefix_sum
+        self.min_prefix_first_key = other.min_prefix_first_key
+        self.min_prefix_last_key = other.min_prefix_last_key
+
+    def extend(self, other):
+
+        """
+        Combines this instance in place with another instance whose keys follow the keys of this instance.
+
+        Args:
+        - other (MinPrefixSumAggregator): The instance to append to this instance.
+        """
+
+        other_min_prefix_sum = self.sum + other.min_prefix_sum
+        if other_min_prefix_sum < self.min_prefix_sum:
+            self.min_prefix_sum = other_min_prefix_sum
+            self.min_prefix_first_key = other.min_prefix_first_key
+            self.min_prefix_last_key = other.min_prefix_last_key
+        elif other_min_prefix_sum == self.min_prefix_sum:
+            self.min_prefix_last_key = other.min_prefix_last_key
+        self.sum += other.sum
+        self.max_key = other.max_key
+
     def __add__(self, other):
 
         """
@@ -45,21 +82,9 @@ class MinPrefixSumAggregator:
         another instance.
         """
 
-        result = MinPrefixSumAggregator(None, 0)
-        result.sum = self.sum + other.sum
-        result.min_key = self.min_key
-        result.max_key = other.max_key
-        other_min_prefix_sum = self.sum + other.min_prefix_sum
-        result.min_prefix_sum = min(self.min_prefix_sum, other_min_prefix_sum)
-
-        if self.min_prefix_sum <= result.min_prefix_sum:
-            result.min_prefix_first_key = self.min_prefix_first_key
-        else:
-            result.min_prefix_first_key = other.min_prefix_first_key
-        if other_min_prefix_sum <= result.min_prefix_sum:
-            result.min_prefix_last_key = other.min_prefix_last_key
-        else:
-            result.min_prefix_last_key = self.min_prefix_last_key
+        result = MinPrefixSumAggregator(self.min_key, self.sum)
+        result.assign(self)
+        result.extend(other)
         return result
 
     def __str__(self):
@@ -77,22 +102,64 @@ class MinPrefixSumAggregator:
         ).format(self)
 
 
+class ZeroPrefixTreapNode(AggregateTreapNode):
+    """
+    A treap node whose value is a MinPrefixSumAggregator. The node owns its aggregate value object, which is recomputed in
+    place, so updating aggregates does not create new objects.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, key, value, priority=0.0):
+
+        """
+        Initializes a new instance of ZeroPrefixTreapNode with its own copy of the value as the aggregate value.
+        """
+
+        super().__init__(key, value, priority)
+        self.aggregate_value = MinPrefixSumAggregator(key, value.sum)
+
+    def update_aggregate_value(self):
+
+        """
+        Recomputes the aggregate value of this node in place from its value and the aggregate values of its children.
+        """
+
+        aggregate_value = self.aggregate_value
+        if self.left is None:
+            aggregate_value.assign(self.value)
+        else:
+            aggregate_value.assign(self.left.aggregate_value)
+            aggregate_value.extend(self.value)
+        if self.right is not None:
+            aggregate_value.extend(self.right.aggregate_value)
+
+
 class ZeroPrefixTreap(Treap):
-    def __init__(self):
+    _node_class = ZeroPrefixTreapNode
+
+    def __init__(self, seed=PRIORITY_SEED):
 
         """
         Initializes a ZeroPrefixTreap object, which is a subclass of the Treap class with a custom aggregation function.
 
         The aggregation function used is the sum of values associated with the keys in the treap.
+
+        Parameters:
+        - seed: The seed of the random generator of node priorities.
         """
 
-        super().__init__(lambda x, y: x + y)
+        super().__init__(lambda x, y: x + y, seed)
 
     def zero_prefix_before(self, key):
 
         """
         Computes the key with the minimum prefix sum of values up to but not including the given key.
 
+        Walks the search path for the key once, keeping the sum of everything left of the current subtree, and remembers
+        the last node or left subtree before the key that reaches a zero prefix sum. Prefix sums are never negative, so
+        that is the last key with the minimum prefix sum.
+
         Parameters:
         - key: The key to compute the minimum prefix sum before.
 
@@ -100,21 +167,43 @@ class ZeroPrefixTreap(Treap):
         - The key with the minimum prefix sum of values up to but not including the given key.
         """
 
-        result = self.aggregate_before(key, include_eq=False)
-        if result is None:
+        prefix_sum = 0
+        is_empty = True
+        last_node, last_subtree, last_offset = None, None, 0
+        node = self._root
+        while node is not None:
+            if node.key < key:
+                is_empty = False
+                left_sum = 0 if node.left is None else node.left.aggregate_value.sum
+                node_prefix_sum = prefix_sum + left_sum + node.value.sum
+                if node_prefix_sum <= 0:
+                    last_node, last_subtree = node, None
+                elif node.left is not None and prefix_sum + node.left.aggregate_value.min_prefix_sum <= 0:
+                    last_node, last_subtree, last_offset = None, node.left, prefix_sum
+                prefix_sum = node_prefix_sum
+                node = node.right
+            else:
+                node = node.left
+
+        if is_empty or prefix_sum == 0:
             return key
-        elif result.min_prefix_sum > 0:
-            return min(result.min_key, key)
-        elif result.sum == 0:
-            return max(result.min_prefix_last_key, key)
-        else:
-            return result.min_prefix_last_key
+        if last_subtree is not None:
+            last_node = self._last_prefix_at_most(last_subtree, last_offset, 0)
+        if last_node is None:
+            node = self._root
+            while node.left is not None:
+                node = node.left
+            return node.key
+        return last_node.key
 
     def zero_prefix_after(self, key):
 
         """
         Computes the key with the minimum prefix sum of values after the given key.
 
+        Walks the search path for the key once, keeping the sum of everything left of the current subtree, and remembers
+        the first node or right subtree after the key that reaches a zero prefix sum.
+
         Parameters:
         - key: The key to compute the minimum prefix sum after.
 
@@ -122,17 +211,158 @@ class ZeroPrefixTreap(Treap):
         - The key with the minimum prefix sum of values after the given key, or None if no such key exists.
         """
 
-        result = self.aggregate_after(key, include_eq=False)
-        if result is None:
+        prefix_sum = 0
+        is_empty = True
+        first_node, first_subtree, first_offset = None, None, 0
+        node = self._root
+        while node is not None:
+            left_sum = 0 if node.left is None else node.left.aggregate_value.sum
+            node_prefix_sum = prefix_sum + left_sum + node.value.sum
+            if key < node.key:
+                is_empty = False
+                if node_prefix_sum <= 0:
+                    first_node, first_subtree = node, None
+                elif node.right is not None and node_prefix_sum + node.right.aggregate_value.min_prefix_sum <= 0:
+                    first_node, first_subtree, first_offset = None, node.right, node_prefix_sum
+                node = node.left
+            else:
+                prefix_sum = node_prefix_sum
+                node = node.right
+
+        if is_empty or prefix_sum == 0:
             return key
-        before_sum = self.aggregate().sum - result.sum
-        min_prefix_in_result = before_sum + result.min_prefix_sum
-        if before_sum == 0:
-            return key
-        elif min_prefix_in_result == 0:
-            return result.min_prefix_first_key
-        else:
-            return None
+        if first_subtree is not None:
+            first_node = self._first_zero_prefix(first_subtree, first_offset)
+        return None if first_node is None else first_node.key
+
+    def prefix_sum(self, key):
+
+        """
+        Computes the sum of values of all keys less than or equal to the given key.
+
+        Parameters:
+        - key: The key to compute the prefix sum up to.
+
+        Returns:
+        - The sum of values of all keys less than or equal to the given key.
+        """
+
+        prefix_sum = 0
+        node = self._root
+        while node is not None:
+            if node.key <= key:
+                left_sum = 0 if node.left is None else node.left.aggregate_value.sum
+                prefix_sum += left_sum + node.value.sum
+                node = node.right
+            else:
+                node = node.left
+        return prefix_sum
+
+    def min_prefix_sum_from(self, key):
+
+        """
+        Computes the smallest prefix sum of values at the given key or at any later key, where the prefix sum at a key
+        includes all keys less than or equal to it.
+
+        Parameters:
+        - key: The key to start from.
+
+        Returns:
+        - The smallest prefix sum at or after the given key.
+        """
+
+        prefix_sum = self.prefix_sum(key)
+        suffix = self.aggregate_after(key)
+        if suffix is None:
+            return prefix_sum
+        return min(prefix_sum, prefix_sum + suffix.min_prefix_sum)
+
+    def last_prefix_at_most(self, key, bound):
+
+        """
+        Finds the last node with a key less than or equal to the given key whose prefix sum is at most the given bound.
+
+        Walks the search path for the key once like zero_prefix_before, remembering the last node or left subtree that
+        reaches the bound, and descends into that subtree only at the end.
+
+        Parameters:
+        - key: The key to search up to.
+        - bound: The largest accepted prefix sum.
+
+        Returns:
+        - The last such node, or None if every prefix sum up to the key is greater than the bound.
+        """
+
+        prefix_sum = 0
+        last_node, last_subtree, last_offset = None, None, 0
+        node = self._root
+        while node is not None:
+            if node.key <= key:
+                left_sum = 0 if node.left is None else node.left.aggregate_value.sum
+                node_prefix_sum = prefix_sum + left_sum + node.value.sum
+                if node_prefix_sum <= bound:
+                    last_node, last_subtree = node, None
+                elif node.left is not None and prefix_sum + node.left.aggregate_value.min_prefix_sum <= bound:
+                    last_node, last_subtree, last_offset = None, node.left, prefix_sum
+                prefix_sum = node_prefix_sum
+                node = node.right
+            else:
+                node = node.left
+
+        if last_subtree is not None:
+            last_node = self._last_prefix_at_most(last_subtree, last_offset, bound)
+        return last_node
+
+    @staticmethod
+    def _last_prefix_at_most(node, offset, bound):
+
+        """
+        Finds the last node in the subtree whose prefix sum is at most the bound, given the sum of all values before the
+        subtree.
+
+        Parameters:
+        - node: The root of the subtree, whose minimum prefix sum plus offset is at most the bound.
+        - offset: The sum of values of all keys before the subtree.
+        - bound: The largest accepted prefix sum.
+
+        Returns:
+        - The last node in the subtree with a prefix sum at most the bound.
+        """
+
+        while True:
+            left_sum = 0 if node.left is None else node.left.aggregate_value.sum
+            node_prefix_sum = offset + left_sum + node.value.sum
+            if node.right is not None and node_prefix_sum + node.right.aggregate_value.min_prefix_sum <= bound:
+                offset = node_prefix_sum
+                node = node.right
+            elif node_prefix_sum <= bound:
+                return node
+            else:
+                node = node.left
+
+    @staticmethod
+    def _first_zero_prefix(node, offset):
+
+        """
+        Finds the first node in the subtree whose prefix sum is zero, given the sum of all values before the subtree.
+
+        Parameters:
+        - node: The root of the subtree, whose minimum prefix sum plus offset is zero.
+        - offset: The sum of values of all keys before the subtree.
+
+        Returns:
+        - The first node in the subtree with a zero prefix sum.
+        """
+
+        while True:
+            if node.left is not None and offset + node.left.aggregate_value.min_prefix_sum <= 0:
+                node = node.left
+                continue
+            left_sum = 0 if node.left is None else node.left.aggregate_value.sum
+            offset += left_sum + node.value.sum
+            if offset <= 0:
+                return node
+            node = node.right
 
     def __getitem__(self, key):
 
@@ -160,6 +390,18 @@ class ZeroPrefixTreap(Treap):
 
         super().__setitem__(key, MinPrefixSumAggregator(key, value))
 
+    def build(self, items):
+
+        """
+        Replaces the contents of the treap with the given (key, value) pairs in linear time, wrapping every value in a
+        MinPrefixSumAggregator object.
+
+        Parameters:
+        - items: An iterable of (key, value) pairs sorted by key in strictly increasing order.
+        """
+
+        super().build((key, MinPrefixSumAggregator(key, value)) for key, value in items)
+
     def __iter__(self):
 
         """
@@ -1,4 +1,13 @@
+from retroactive_data_structures.partially_retroactive_priority_queue.treap import Treap
+from retroactive_data_structures.partially_retroactive_priority_queue.zero_prefix_treap import ZeroPrefixTreap
+from retroactive_data_structures.partially_retroactive_queue_and_stack.time_allocator import time_between
+from retroactive_data_structures.snapshot import ColumnFile, save_columns
+from retroactive_data_structures.write_ahead_log import read_operations
+
+
 class BaseNode():
+    __slots__ = ('value', 'prev', 'next')
+
     def __init__(self, prev, next, value=None):
         self.value = value
         self.prev = prev
@@ -14,138 +23,338 @@ class BaseNode():
 
 
 class BaseOperation():
+    __slots__ = ('time', 'node')
+
     def __init__(self, time, node):
         self.time = time
         self.node = node
 
-    def __eq__(self, other):
-        if isinstance(other, int):
-            return self.time == other
-        elif isinstance(other, BaseOperation):
-            return self.time == other.time
-        return NotImplemented
-
-    def __lt__(self, other):
-        if isinstance(other, int):
-            return self.time < other
-        elif isinstance(other, BaseOperation):
-            return self.time < other.time
-        return NotImplemented
-
-    def __le__(self, other):
-        if isinstance(other, int):
-            return self.time <= other
-        elif isinstance(other, BaseOperation):
-            return self.time <= other.time
-        return NotImplemented
-
-    def __ne__(self, other):
-        if isinstance(other, int):
-            return self.time != other
-        elif isinstance(other, BaseOperation):
-            return self.time != other.time
-        return NotImplemented
-
-    def __gt__(self, other):
-        if isinstance(other, int):
-            return self.time > other
-        elif isinstance(other, BaseOperation):
-            return self.time > other.time
-        return NotImplemented
-
-    def __ge__(self, other):
-        if isinstance(other, int):
-            return self.time >= other
-        elif isinstance(other, BaseOperation):
-            return self.time >= other.time
-        return NotImplemented
+    @property
+    def is_insert(self):
+
+        """
+        True for an enqueue or push, False for a dequeue or pop.
+        """
+
+        raise NotImplementedError
+
+
+def next_time_after(max_time):
+
+    """
+    Default policy for the time of an operation added without one: 10 after the maximum time, or 10 if there are no
+    operations yet. Pass another function as next_time to use time values that do not support adding an int.
+    """
+
+    return 10 if max_time is None else max_time + 10
 
 
 class BasePartiallyRetroactive():
-    def __init__(self):
-        self.operations = []
+    REBUILD_RATIO = 4
+
+    def __init__(self, next_time=next_time_after):
+
+        """
+        Operations are indexed by their time values, which can be any mutually comparable and hashable values, e.g. ints,
+        floats, datetimes or (epoch, seq) tuples. next_time returns the time of an operation added without one, given
+        the maximum time value or None if there are no operations.
+        Operations are also kept in a ZeroPrefixTreap with weight +1 for an enqueue or push and -1 for a dequeue or pop,
+        so that the size at any time and changes that would leave a later dequeue or pop with nothing to remove are
+        found in O(log n).
+        """
+
+        self.operations = Treap()
+        self._operations_by_time = {}
+        self._weights = ZeroPrefixTreap()
+        self._next_time_after = next_time
+        self._write_ahead_log = None
+
+    @classmethod
+    def from_operations(cls, operations, is_sorted=True, next_time=next_time_after):
+
+        """
+        Build a new instance from an iterable of (time, is_insert, value) tuples in a single pass, where is_insert marks
+        an enqueue/push and is False for a dequeue/pop (whose value is ignored). The result is the same as applying the
+        operations one by one in time order. If is_sorted is False, the operations are sorted by time first.
+        If two operations have the same time, or the operations are not sorted, raise ValueError.
+        """
+
+        if not is_sorted:
+            operations = sorted(operations, key=lambda operation: operation[0])
+        instance = cls(next_time)
+        indexed_operations = []
+        previous_time = None
+        for time, is_insert, value in operations:
+            if previous_time is not None and time <= previous_time:
+                raise ValueError
+            previous_time = time
+            operation = instance._append_operation(time, is_insert, value)
+            if operation is not None:
+                indexed_operations.append((time, operation))
+        instance._index_operations(indexed_operations)
+        return instance
+
+    def save(self, path):
+
+        """
+        Write the operations to a file in the compact columnar binary layout of save_columns, including which enqueued or
+        pushed node every dequeue or pop removed, so that load restores exactly the same state.
+        """
+
+        save_columns(path, self._snapshot_columns())
+
+    @classmethod
+    def load(cls, path, next_time=next_time_after):
+
+        """
+        Build a new instance from a file written by save. The file is memory-mapped and read in a single pass.
+        """
+
+        with ColumnFile(path) as column_file:
+            return cls._from_columns(column_file, next_time)
+
+    @classmethod
+    def from_log(cls, path, next_time=next_time_after):
+
+        """
+        Build a new instance from a write-ahead log. The operations that were not deleted afterwards are passed to
+        from_operations in time order. Queues and stacks only depend on their operations, not on the order in which
+        they were inserted, and operations that were not applied are not logged, so the result has the same state as
+        the logged instance.
+        """
+
+        return cls.from_operations(
+            ((time, is_insert, value) for time, is_insert, value, _ in read_operations(path)), next_time=next_time
+        )
+
+    def log_to(self, write_ahead_log):
+
+        """
+        Log every operation that is added or deleted from now on to the given WriteAheadLog. Pass None to stop logging.
+        """
+
+        self._write_ahead_log = write_ahead_log
+
+    def _snapshot_columns(self):
+
+        """
+        Return the columns written by save.
+        """
+
+        raise NotImplementedError
+
+    @classmethod
+    def _from_columns(cls, column_file, next_time):
+
+        """
+        Build a new instance from the columns of a ColumnFile written by save.
+        """
+
+        raise NotImplementedError
+
+    def apply_batch(self, operations):
+
+        """
+        Insert a batch of (time, is_insert, value) operations, in the same format as from_operations, in any order.
+        All times are checked before anything is applied: if a time value already exists or appears twice in the batch,
+        raise ValueError. Return the list of new Operation objects.
+        Small batches are applied one operation at a time. When the batch has at least 1/REBUILD_RATIO as many operations
+        as the structure already holds, it is merged with the existing operations in a single pass and the present
+        state is rebuilt once in linear time instead. The result is the same as inserting the operations one by one.
+        """
+
+        operations = sorted(operations, key=lambda operation: operation[0])
+        for index, operation in enumerate(operations):
+            time = operation[0]
+            if self._has_operation(time) or (index > 0 and operations[index - 1][0] == time):
+                raise ValueError
+        return self._apply_sorted_batch(operations)
 
     def get_max_time(self):
 
         """
-        Find maximum time value. When no time is passed to operation, this value will be incremented by 10.
+        Find maximum time value. When no time is passed to operation, the default next_time increments this value by 10.
         """
 
-        #return max(self.operations, key=lambda x: x.time).time
-        if len(self.operations) > 0:
-            return self.operations[-1].time
+        last_operation = self.operations.find_max()
+        if last_operation is not None:
+            return last_operation.key
         else:
             return 0
 
+    def _next_time(self):
+
+        """
+        Return the time of an operation added without a time value.
+        """
+
+        last_operation = self.operations.find_max()
+        return self._next_time_after(None if last_operation is None else last_operation.key)
+
+    def time_after(self, time):
+
+        """
+        Return a new time value between the given time and the time of the next operation, so that an operation can be
+        inserted right after the operation at the given time without renumbering any operation. Time values must be
+        tuples of ints, e.g. with next_time=next_tuple_time.
+        """
+
+        operation_after = self.operations.find_after(time)
+        return time_between(time, None if operation_after is None else operation_after.key)
+
     def is_initialized(self):
         pass
 
-    def _find_operation(self, time):
+    def _append_operation(self, time, is_insert, value):
 
         """
-        Find the Operation object with the given time value. If no such object exists, return None.
+        Apply operation after all existing operations without adding it to the operations index.
+        Return the new Operation object, or None if the operation has no effect.
         """
 
-        operations_at_time = filter(lambda x: x.time == time, self.operations)
-        list_operations_at_time = list(operations_at_time)
-        if len(list_operations_at_time) == 0:
-            return None
-        return list_operations_at_time[0]
+        raise NotImplementedError
 
-    def _find_operation_binary_search(self, time):
+    def _index_operations(self, indexed_operations):
 
         """
-        Find the Operation object with the given time value using binary search.
-        If no such object exists, return None.
-        Note that this implementation assumes that self.operations is already sorted in descending order by time.
+        Replace the contents of all operations indexes with the given time sorted (time, Operation) pairs in linear time.
         """
 
-        if not self.operations:
-            return None
-        left = 0
-        right = len(self.operations) - 1
-        while left <= right:
-            mid = (left + right) // 2
-            if time == self.operations[mid].time:
-                return self.operations[mid]
-            elif time < self.operations[mid].time:
-                right = mid - 1
-            else:
-                left = mid + 1
-        return None
+        self.operations.build(indexed_operations)
+        self._operations_by_time = dict(indexed_operations)
+        self._weights.build((time, 1 if operation.is_insert else -1) for time, operation in indexed_operations)
 
-    def _find_operation_after(self, time):
+    def _add_operation(self, operation):
 
         """
-        Filter the list to only keep Operation objects whose time value is greater than passed time value.
-        Find the minimum object from the filtered list based on its time value. Otherwise, None is returned.
+        Add the Operation object to the ordered operations index, to the hashed index and to the weights, keyed by its
+        time value, and log it if a write-ahead log is attached.
         """
 
-        operations_after = filter(lambda x: x.time > time, self.operations)
-        list_operations_after = list(operations_after)
-        if len(list_operations_after) == 0:
-            return None
-        min_operation_after = min(list_operations_after, key=lambda x: x.time)
-        return min_operation_after
+        self.operations.insert(operation.time, operation)
+        self._operations_by_time[operation.time] = operation
+        self._weights[operation.time] = 1 if operation.is_insert else -1
+        if self._write_ahead_log is not None:
+            self._write_ahead_log.log_insert(
+                operation.time, operation.is_insert, operation.node.value if operation.is_insert else None
+            )
 
-    def _find_operation_after_binary_search(self, time):
+    def _remove_operation(self, operation):
 
         """
-        Find the smallest time value of Operation object that is larger than the passed time value using binary search.
-        Otherwise, None is returned. Note that this implementation assumes that self.operations is already sorted in descending order by time.
+        Remove the Operation object from both operations indexes and log the removal if a write-ahead log is attached.
         """
 
-        if not self.operations or self.operations[-1].time <= time:
-            return None
-        left = 0
-        right = len(self.operations) - 1
-        while left <= right:
-            mid = (left + right) // 2
-            if time > self.operations[mid].time:
-                if mid == len(self.operations) - 1 or time <= self.operations[mid + 1].time:
-                    return self.operations[mid + 1]
-                else:
-                    left = mid + 1
+        self.operations.delete(operation.time)
+        del self._operations_by_time[operation.time]
+        self._weights.delete(operation.time)
+        if self._write_ahead_log is not None:
+            self._write_ahead_log.log_delete(operation.time)
+
+    def _apply_sorted_batch(self, operations):
+
+        """
+        Apply a batch of operations that is sorted by time and whose times are not in use, one operation at a time or
+        with a single merge and rebuild, and log the new operations if a write-ahead log is attached.
+        """
+
+        if len(operations) * self.REBUILD_RATIO < len(self._operations_by_time):
+            new_operations = []
+            for time, is_insert, value in operations:
+                operation = self._insert_operation(time, is_insert, value)
+                if operation is not None:
+                    new_operations.append(operation)
+            return new_operations
+
+        new_operations = self._rebuild(self._merge_timeline(operations))
+        if self._write_ahead_log is not None:
+            for operation in new_operations:
+                self._write_ahead_log.log_insert(
+                    operation.time, operation.is_insert, operation.node.value if operation.is_insert else None
+                )
+        return new_operations
+
+    def _merge_timeline(self, operations):
+
+        """
+        Merge a time sorted batch of (time, is_insert, value) operations with the existing operations in a single pass and
+        return the merged list of (time, is_insert, value, operation) tuples, where operation is None for an operation of
+        the batch and value is None for an existing one.
+        A dequeue or pop of the batch is left out when inserting the batch one operation at a time would not apply it:
+        when, with the operations of the batch before it, it would leave itself or an existing later dequeue or pop with
+        nothing to remove. The smallest prefix sum of the existing operations from every position on is precomputed
+        for this in a backwards pass.
+        """
+
+        existing = list(self.operations)
+        prefix_sums = []
+        prefix_sum = 0
+        for _, operation in existing:
+            prefix_sum += 1 if operation.is_insert else -1
+            prefix_sums.append(prefix_sum)
+        lowest_from = [float('inf')] * (len(existing) + 1)
+        for index in range(len(existing) - 1, -1, -1):
+            lowest_from[index] = min(prefix_sums[index], lowest_from[index + 1])
+
+        timeline = []
+        index = 0
+        offset = 0
+        for time, is_insert, value in operations:
+            while index < len(existing) and existing[index][0] < time:
+                existing_time, operation = existing[index]
+                timeline.append((existing_time, operation.is_insert, None, operation))
+                index += 1
+            if is_insert:
+                offset += 1
             else:
-                right = mid - 1
-        return None
\ No newline at end of file
+                prefix_sum_before = prefix_sums[index - 1] if index > 0 else 0
+                if offset + min(prefix_sum_before, lowest_from[index]) < 1:
+                    continue
+                offset -= 1
+            timeline.append((time, is_insert, value, None))
+        for existing_time, operation in existing[index:]:
+            timeline.append((existing_time, operation.is_insert, None, operation))
+        return timeline
+
+    def _insert_operation(self, time, is_insert, value):
+
+        """
+        Insert a single enqueue/push or dequeue/pop at the given time and return the new Operation object, or None if it
+        was not applied.
+        """
+
+        raise NotImplementedError
+
+    def _rebuild(self, timeline):
+
+        """
+        Rebuild the present state and all indexes from a merged timeline returned by _merge_timeline in linear time,
+        keeping the existing Operation and node objects, and return the new Operation objects in time order.
+        """
+
+        raise NotImplementedError
+
+    def _find_operation(self, time):
+
+        """
+        Find the Operation object with the given time value. If no such object exists, return None.
+        """
+
+        return self._operations_by_time.get(time)
+
+    def _would_empty(self, time):
+
+        """
+        Check whether a dequeue or pop at the given time, or the removal of the enqueue or push at that time, would leave
+        this or a later dequeue or pop with nothing to remove.
+        """
+
+        return self._weights.min_prefix_sum_from(time) < 1
+
+    def _has_operation(self, time):
+
+        """
+        Check whether an operation with the given time value exists.
+        """
+
+        return time in self._operations_by_time
@@ -1,25 +1,56 @@
-import bisect
+from retroactive_data_structures.partially_retroactive_priority_queue.order_statistic_treap import OrderStatisticTreap
 from retroactive_data_structures.partially_retroactive_queue_and_stack.base import BaseNode, BaseOperation, \
-    BasePartiallyRetroactive
+    BasePartiallyRetroactive, next_time_after
 
 
 class Node(BaseNode):
-    def __init__(self, prev, next, value=None):
+    __slots__ = ('time',)
+
+    def __init__(self, prev, next, value=None, time=None):
         super().__init__(prev, next, value)
-        self.is_before_first = False
+        self.time = time
 
 
 class Operation(BaseOperation):
+    __slots__ = ('is_enqueue',)
+
     def __init__(self, time, node, is_enqueue):
         super().__init__(time, node)
         self.is_enqueue = is_enqueue
 
+    @property
+    def is_insert(self):
+        return self.is_enqueue
+
 
 class PartiallyRetroactiveQueue(BasePartiallyRetroactive):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, next_time=next_time_after):
+
+        """
+        All enqueued nodes, including the dequeued ones, are kept in a doubly linked list in enqueue time order and are
+        indexed by their enqueue time in an order statistic treap. With d dequeues, the first node of the queue is the
+        enqueued node with rank d, so the queue is always the same as if its operations were applied in time order.
+        """
+
+        super().__init__(next_time)
         self.first = None
         self.last = None
+        self.tail = None
+        self._enqueued_nodes = OrderStatisticTreap()
+
+    @classmethod
+    def from_operations(cls, operations, is_sorted=True, next_time=next_time_after):
+
+        """
+        Build a new queue from an iterable of (time, is_enqueue, value) tuples, then index the enqueued nodes by their
+        enqueue time in linear time.
+        """
+
+        instance = super().from_operations(operations, is_sorted, next_time)
+        instance._enqueued_nodes.build(
+            (time, operation.node) for time, operation in instance.operations if operation.is_enqueue
+        )
+        return instance
 
     def is_initialized(self):
         if self.first is None and self.last is None:
@@ -32,101 +63,239 @@ class PartiallyRetroactiveQueue(BasePartiallyRetroactive):
     def get_last(self):
         return None if self.last is None else self.last.value
 
+    def _enqueue_last(self, value, time):
+
+        """
+        Add a new node with the given value and enqueue time after the tail, the last node of the whole list, and return
+        it. The node is not indexed in _enqueued_nodes.
+        """
+
+        node = Node(self.tail, None, value, time)
+        if self.tail is not None:
+            self.tail.next = node
+        if self.first is None:
+            self.first = node
+        self.tail = node
+        self.last = node
+        return node
+
+    def _dequeue_first(self):
+
+        """
+        Move the first pointer to the next node and return the dequeued node. If the queue is empty, return None.
+        """
+
+        if not self.is_initialized():
+            return None
+        node_to_dequeue = self.first
+        self.first = self.first.next
+        if self.first is None:
+            self.last = None
+        return node_to_dequeue
+
+    def _append_operation(self, time, is_enqueue, value):
+
+        """
+        Apply enqueue or dequeue operation after all existing operations, without adding it to the operations index.
+        """
+
+        if is_enqueue:
+            return Operation(time, self._enqueue_last(value, time), True)
+        node_to_dequeue = self._dequeue_first()
+        if node_to_dequeue is None:
+            return None
+        return Operation(time, node_to_dequeue, False)
+
+    def _link(self, node):
+
+        """
+        Link the node into the list between the nodes enqueued right before and right after it and index it. The node
+        after it is found in O(log(n)) by enqueue time.
+        """
+
+        node_after = self._enqueued_nodes.find_after(node.time)
+        if node_after is None:
+            node.prev = self.tail
+            self.tail = node
+        else:
+            node.next = node_after.value
+            node.prev = node.next.prev
+            node.next.prev = node
+        if node.prev is not None:
+            node.prev.next = node
+        self._enqueued_nodes.insert(node.time, node)
+
+    def _unlink(self, node):
+
+        """
+        Take the node out of the list and out of the index.
+        """
+
+        if node.prev is not None:
+            node.prev.next = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+        self._enqueued_nodes.delete(node.time)
+
+    def _update_first(self):
+
+        """
+        Point first at the enqueued node whose rank is the number of dequeues, and last at the tail unless the queue is
+        empty.
+        """
+
+        dequeued = len(self._operations_by_time) - len(self._enqueued_nodes)
+        first = self._enqueued_nodes.select(dequeued)
+        self.first = None if first is None else first.value
+        self.last = None if first is None else self.tail
+
+    def _dequeued_node(self, time):
+
+        """
+        Return the node removed by the dequeue at the given time. The k-th dequeue in time order removes the k-th
+        enqueued node.
+        """
+
+        enqueued = self._enqueued_nodes.aggregate_before(time)
+        dequeued = enqueued - self._weights.prefix_sum(time)
+        return self._enqueued_nodes.select(dequeued - 1).value
+
+    def _find_operation(self, time):
+
+        """
+        Find the Operation object with the given time value, or None. The node of a dequeue is bound again to the node
+        it removes now, which changes when earlier operations are inserted or deleted.
+        """
+
+        operation = super()._find_operation(time)
+        if operation is not None and not operation.is_enqueue:
+            operation.node = self._dequeued_node(time)
+        return operation
+
+    def _insert_operation(self, time, is_enqueue, value):
+        return self.insert_enqueue(value, time) if is_enqueue else self.insert_dequeue(time)
+
+    def _rebuild(self, timeline):
+
+        """
+        Link all enqueued nodes of the merged timeline in time order, bind the k-th dequeue to the k-th enqueued node,
+        rebuild the indexes in linear time and point first at the node whose rank is the number of dequeues.
+        """
+
+        nodes, dequeues, indexed_operations, new_operations = [], [], [], []
+        for time, is_enqueue, value, operation in timeline:
+            if operation is None:
+                operation = Operation(time, Node(None, None, value, time) if is_enqueue else None, is_enqueue)
+                new_operations.append(operation)
+            if is_enqueue:
+                nodes.append(operation.node)
+            else:
+                dequeues.append(operation)
+            indexed_operations.append((time, operation))
+
+        for index, node in enumerate(nodes):
+            node.prev = nodes[index - 1] if index > 0 else None
+            node.next = nodes[index + 1] if index + 1 < len(nodes) else None
+        for operation, node in zip(dequeues, nodes):
+            operation.node = node
+        self.tail = nodes[-1] if nodes else None
+        self._index_operations(indexed_operations)
+        self._enqueued_nodes.build((node.time, node) for node in nodes)
+        self._update_first()
+        return new_operations
+
+    def _snapshot_columns(self):
+
+        """
+        Return the columns written by save: the time and type of every operation and the value of every enqueue. The
+        queue only depends on its operations, so load replays them in time order.
+        """
+
+        times, is_enqueues, values = [], [], []
+        for time, operation in self.operations:
+            times.append(time)
+            is_enqueues.append(operation.is_enqueue)
+            if operation.is_enqueue:
+                values.append(operation.node.value)
+        return [times, is_enqueues, values]
+
+    @classmethod
+    def _from_columns(cls, column_file, next_time):
+
+        """
+        Build a new queue from the columns written by save in a single pass.
+        """
+
+        values = iter(column_file.column(2))
+        return cls.from_operations(
+            ((time, is_enqueue, next(values) if is_enqueue else None)
+             for time, is_enqueue in zip(column_file.column(0), column_file.column(1))),
+            next_time=next_time,
+        )
+
     def insert_enqueue(self, value, time=None):
 
         """
         Insert enqueue operation at specific time. If time value already exists raise ValueError.
-        Find operation after passed time value and add enqueue operation before it. If there is no operation after passed time value, add enqueue operation at the end.
+        The new node is linked between the nodes enqueued right before and right after it, and the first pointer is
+        moved to the node with the same rank as before.
         """
 
         if time is None:
-            time = self.get_max_time() + 10
+            time = self._next_time()
 
-        if time in self.operations:
+        if self._has_operation(time):
             raise ValueError
 
-        if not self.is_initialized():
-            node = Node(None, None, value)
-            self.last = node
-            self.first = node
-            node.is_before_first = True
-            operation = Operation(time, node, True)
-            self.operations.insert(bisect.bisect_left(self.operations, operation), operation)
-            return operation
-
-        operation_after = self._find_operation_after_binary_search(time)
-        if operation_after is None:
-            node = Node(self.last, None, value)
-            self.last.next = node
-            self.last = node
-        else:
-            node_after = operation_after.node
-            node = Node(node_after.prev, node_after, value)
-            if node_after.prev is not None:
-                node_after.prev.next = node
-            node_after.prev = node
-            if node_after.is_before_first:
-                if self.first is not None:
-                    self.first.is_before_first = False
-                    self.first = self.first.prev
-                    self.first.is_before_first = True
+        node = Node(None, None, value, time)
+        self._link(node)
         operation = Operation(time, node, True)
-        self.operations.insert(bisect.bisect_left(self.operations, operation), operation)
+        self._add_operation(operation)
+        self._update_first()
         return operation
 
     def insert_dequeue(self, time=None):
 
         """
         Insert dequeue operation at specific time. If time value already exists raise ValueError.
-        Dequeue first node.
+        If the queue would be empty for this or a later dequeue, nothing is dequeued and None is returned.
         """
 
         if time is None:
-            time = self.get_max_time() + 10
+            time = self._next_time()
 
-        if time in self.operations:
+        if self._has_operation(time):
             raise ValueError
 
-        if not self.is_initialized():
+        if self._would_empty(time):
             return None
-        node_to_dequeue = self.first
-        self.first = self.first.next
-        if self.first is not None:
-            self.first.is_before_first = True
-        else:
-            self.last = None
-        operation = Operation(time, node_to_dequeue, False)
-        self.operations.insert(bisect.bisect_left(self.operations, operation), operation)
+        operation = Operation(time, None, False)
+        self._add_operation(operation)
+        operation.node = self._dequeued_node(time)
+        self._update_first()
         return operation
 
     def delete_operation(self, time):
 
         """
-        Delete operation at specific time. If time value does not exists raise ValueError.
-        If operation type is enqueue, remove enqueued node.
-        if operation type is dequeue, put back dequeued node.
+        Delete operation at specific time. If time value does not exists, or a later dequeue would be applied to an
+        empty queue without it, raise ValueError.
+        If operation type is enqueue, remove enqueued node. In both cases the first pointer is moved to the node whose
+        rank is the new number of dequeues.
         """
 
-        if time not in self.operations:
+        if not self._has_operation(time):
             raise ValueError
 
-        operation = self._find_operation_binary_search(time)
-        node, is_enqueue = (operation.node, operation.is_enqueue)
-        if is_enqueue:
-            if node.next is not None:
-                node.next.prev = node.prev
-            else:
-                self.last = node.prev
-            if node.prev is not None:
-                node.prev.next = node.next
-            if node.is_before_first:
-                self.first = self.first.next
-                self.first.is_before_first = True
-        else:
-            self.first.is_before_first = False
-            node.next = self.first
-            self.first = node
-        self.operations.remove(operation)
+        operation = self._operations_by_time[time]
+        if operation.is_enqueue:
+            if self._would_empty(time):
+                raise ValueError
+            self._unlink(operation.node)
+        self._remove_operation(operation)
+        self._update_first()
         return None
 
     def __iter__(self):
@@ -1,24 +1,54 @@
-import bisect
+from retroactive_data_structures.partially_retroactive_priority_queue.treap import Treap
 from retroactive_data_structures.partially_retroactive_queue_and_stack.base import BasePartiallyRetroactive, BaseNode, \
-    BaseOperation
+    BaseOperation, next_time_after
 
 
 class Node(BaseNode):
-    def __init__(self, prev, next, value=None):
+    __slots__ = ('is_popped', 'time')
+
+    def __init__(self, prev, next, value=None, time=None):
         super().__init__(prev, next, value)
         self.is_popped = False
+        self.time = time
 
 
 class Operation(BaseOperation):
+    __slots__ = ('is_push',)
+
     def __init__(self, time, node, is_push):
         super().__init__(time, node)
         self.is_push = is_push
 
+    @property
+    def is_insert(self):
+        return self.is_push
+
 
 class PartiallyRetroactiveStack(BasePartiallyRetroactive):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, next_time=next_time_after):
+
+        """
+        The nodes still on the stack are linked in push time order and indexed by their push time in _live_nodes. A pop
+        removes the push right after the last earlier time whose prefix sum of the +1/-1 weights is at most the prefix
+        sum after the pop, so the stack is always the same as if its operations were applied in time order, and the node
+        that an inserted or deleted operation puts back or takes off is found in O(log(n)).
+        """
+
+        super().__init__(next_time)
         self.top = None
+        self._live_nodes = Treap()
+
+    @classmethod
+    def from_operations(cls, operations, is_sorted=True, next_time=next_time_after):
+
+        """
+        Build a new stack from an iterable of (time, is_push, value) tuples, then index the nodes left on the stack by
+        their push time in linear time.
+        """
+
+        instance = super().from_operations(operations, is_sorted, next_time)
+        instance._live_nodes.build((node.time, node) for node in reversed(list(instance)))
+        return instance
 
     def is_initialized(self):
         return not self.top is None
@@ -26,154 +56,253 @@ class PartiallyRetroactiveStack(BasePartiallyRetroactive):
     def get_top(self):
         return None if self.top is None else self.top.value
 
-    def _find_operation_after_binary_search(self, time):
+    def _snapshot_columns(self):
+
+        """
+        Return the columns written by save: the time and type of every operation and the value of every push. The stack
+        only depends on its operations, so load replays them in time order.
+        """
+
+        times, is_pushes, values = [], [], []
+        for time, operation in self.operations:
+            times.append(time)
+            is_pushes.append(operation.is_push)
+            if operation.is_push:
+                values.append(operation.node.value)
+        return [times, is_pushes, values]
+
+    @classmethod
+    def _from_columns(cls, column_file, next_time):
+
+        """
+        Build a new stack from the columns written by save in a single pass.
+        """
+
+        values = iter(column_file.column(2))
+        return cls.from_operations(
+            ((time, is_push, next(values) if is_push else None)
+             for time, is_push in zip(column_file.column(0), column_file.column(1))),
+            next_time=next_time,
+        )
+
+    def _push_after_prefix_at_most(self, time, bound):
+
+        """
+        Return the node of the push right after the last operation at or before the given time whose prefix sum is at
+        most the given bound, or of the first push if there is no such operation.
+        """
+
+        node = self._weights.last_prefix_at_most(time, bound)
+        node = self._weights.find_min() if node is None else self._weights.find_after(node.key)
+        return self._operations_by_time[node.key].node
+
+    def _popped_node(self, time):
+
+        """
+        Return the node removed by the pop at the given time: the push right after the last earlier operation whose
+        prefix sum is at most the prefix sum after the pop.
+        """
+
+        operation_before = self._weights.find_before(time)
+        return self._push_after_prefix_at_most(operation_before.key, self._weights.prefix_sum(time))
+
+    def _find_operation(self, time):
 
         """
-        Find the smallest time value of Operation object that is larger than the passed time value using binary search.
-        Return the first one that is not popped. Otherwise, None is returned.
-        Note that this implementation assumes that self.operations is already sorted in descending order by time.
+        Find the Operation object with the given time value, or None. The node of a pop is bound again to the node it
+        removes now, which changes when earlier operations are inserted or deleted.
         """
 
-        if not self.operations or self.operations[-1].time <= time:
+        operation = super()._find_operation(time)
+        if operation is not None and not operation.is_push:
+            operation.node = self._popped_node(time)
+        return operation
+
+    def _link(self, node):
+
+        """
+        Put the node back on the stack between the nodes pushed right before and right after it that are still on the
+        stack. The node after it is found in O(log(n)) by push time, and the prev pointers of nodes on the stack are
+        always up to date, so the node before it is the previous node of that one.
+        """
+
+        node.is_popped = False
+        live_node_after = self._live_nodes.find_after(node.time)
+        node.next = None if live_node_after is None else live_node_after.value
+        node.prev = self.top if node.next is None else node.next.prev
+        self._live_nodes.insert(node.time, node)
+        if node.prev is not None:
+            node.prev.next = node
+        if node.next is not None:
+            node.next.prev = node
+        else:
+            self.top = node
+
+    def _unlink(self, node):
+
+        """
+        Take the node off the stack and mark it as popped.
+        """
+
+        node.is_popped = True
+        self._live_nodes.delete(node.time)
+        if node.prev is not None:
+            node.prev.next = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        else:
+            self.top = node.prev
+
+    def _push_top(self, value, time):
+
+        """
+        Add a new node with the given value and push time on top of the stack and return it. The node is not indexed in
+        _live_nodes.
+        """
+
+        if not self.is_initialized():
+            node = Node(None, None, value, time)
+        else:
+            node = Node(self.top, None, value, time)
+            self.top.next = node
+        self.top = node
+        return node
+
+    def _pop_top(self):
+
+        """
+        Mark the top node as popped, move the top pointer to the previous node and return the popped node. The node is
+        not removed from _live_nodes. If the stack is empty, return None.
+        """
+
+        if not self.is_initialized():
             return None
-        left = 0
-        right = len(self.operations) - 1
-        while left <= right:
-            mid = (left + right) // 2
-            if time > self.operations[mid].time:
-                if mid == len(self.operations) - 1 or time <= self.operations[mid + 1].time:
-                    while self.operations[mid+1].node.is_popped:
-                        mid += 1
-                    return self.operations[mid+1]
-                else:
-                    left = mid + 1
+        node = self.top
+        self.top = node.prev
+        if self.top is not None:
+            self.top.next = None
+        node.is_popped = True
+        return node
+
+    def _append_operation(self, time, is_push, value):
+
+        """
+        Apply push or pop operation after all existing operations, without adding it to the operations index.
+        """
+
+        if is_push:
+            return Operation(time, self._push_top(value, time), True)
+        node_to_pop = self._pop_top()
+        if node_to_pop is None:
+            return None
+        return Operation(time, node_to_pop, False)
+
+    def _insert_operation(self, time, is_push, value):
+        return self.insert_push(value, time) if is_push else self.insert_pop(time)
+
+    def _rebuild(self, timeline):
+
+        """
+        Replay the merged timeline with a list as the stack, binding every pop to the node it removes, then link the
+        nodes left on the stack and rebuild the indexes in linear time.
+        """
+
+        stack, indexed_operations, new_operations = [], [], []
+        for time, is_push, value, operation in timeline:
+            if operation is None:
+                operation = Operation(time, Node(None, None, value, time) if is_push else None, is_push)
+                new_operations.append(operation)
+            if is_push:
+                operation.node.is_popped = False
+                stack.append(operation.node)
             else:
-                right = mid - 1
-        return None
+                operation.node = stack.pop()
+                operation.node.is_popped = True
+            indexed_operations.append((time, operation))
+
+        for index, node in enumerate(stack):
+            node.prev = stack[index - 1] if index > 0 else None
+            node.next = stack[index + 1] if index + 1 < len(stack) else None
+        self.top = stack[-1] if stack else None
+        self._index_operations(indexed_operations)
+        self._live_nodes.build((node.time, node) for node in stack)
+        return new_operations
 
     def insert_push(self, value, time=None):
 
         """
-        Inserts a new push operation with the given value and time into the queue.
-        Find operation after passed time value and add push operation before it. If there is no operation after passed time value, add push operation at the end.
+        Inserts a new push operation with the given value and time into the stack.
+        If no later pop takes the stack below its size before the passed time value, the new node is linked between the
+        nodes still on the stack that were pushed right before and right after it. Otherwise the new node is popped by a
+        later pop, and the node of the earlier push that the last such pop removed is put back on the stack instead.
         """
 
         if time is None:
-            time = self.get_max_time() + 10
+            time = self._next_time()
 
-        if time in self.operations:
+        if self._has_operation(time):
             raise ValueError
 
-        if not self.is_initialized():
-            node = Node(None, None, value)
-            self.top = node
-            operation = Operation(time, node, True)
-            self.operations.insert(bisect.bisect_left(self.operations, operation), operation)
-            return operation
-
-        operation_after = self._find_operation_after_binary_search(time)
-        if operation_after is None:
-            node = Node(self.top, None, value)
-            self.top.next = node
-            self.top = node
+        node = Node(None, None, value, time)
+        lowest = self._weights.min_prefix_sum_from(time)
+        if lowest < self._weights.prefix_sum(time):
+            node.is_popped = True
+            self._link(self._push_after_prefix_at_most(time, lowest))
         else:
-            node_after = operation_after.node
-            node = Node(node_after.prev, node_after, value)
-            if node_after.prev is not None:
-                node_after.prev.next = node
-            node_after.prev = node
-
+            self._link(node)
         operation = Operation(time, node, True)
-        self.operations.insert(bisect.bisect_left(self.operations, operation), operation)
+        self._add_operation(operation)
+        return operation
 
     def insert_pop(self, time=None):
 
         """
         Insert pop operation at specific time. If time value already exists raise ValueError.
-        Find operation after passed time value and add pop operation before it. If there is no operation after passed time value, add pop operation at the end.
+        Pop the node that a pop at the passed time value removes when the operations are applied in time order; every
+        later pop that removed a node below it removes the node the previous one removed instead, so only that node
+        leaves the stack. If the stack would be empty for this or a later pop, nothing is popped and None is returned.
         """
 
         if time is None:
-            time = self.get_max_time() + 10
+            time = self._next_time()
 
-        if time in self.operations:
+        if self._has_operation(time):
             raise ValueError
 
-        if not self.is_initialized():
+        if self._would_empty(time):
             return None
-
-        operation_after = self._find_operation_after_binary_search(time)
-        if operation_after is None:
-            node = self.top
-            self.top = node.prev if node is not None else None
-        else:
-            node_after = operation_after.node
-            node_to_pop = node_after.prev
-            if node_to_pop is not None:
-                if node_to_pop.prev is not None:
-                    node_to_pop.prev.next = node_after
-                node_after.prev = node_to_pop.prev
-            node = node_to_pop
-        node.is_popped = True
-        operation = Operation(time, node, False)
-        self.operations.insert(bisect.bisect_left(self.operations, operation), operation)
+        node = self._push_after_prefix_at_most(time, self._weights.min_prefix_sum_from(time) - 1)
+        self._unlink(node)
+        operation = Operation(time, None, False)
+        self._add_operation(operation)
+        operation.node = self._popped_node(time)
         return operation
 
     def delete_operation(self, time):
 
         """
-        Delete operation at specific time. If time value does not exists raise ValueError.
-        If operation type is push, remove pushed node.
-        if operation type is pop, put back popped node.
+        Delete operation at specific time. If time value does not exists, or a later pop would be applied to an empty
+        stack without it, raise ValueError.
+        If operation type is push and its node is still on the stack, remove the node. If the node was popped, the pops
+        after it are bound again as if a pop was inserted right after the push.
+        if operation type is pop, put back the node that a pop at that time would remove once it is deleted.
         """
 
-        if time not in self.operations:
+        if not self._has_operation(time):
             raise ValueError
 
-        operation = self._find_operation_binary_search(time)
-        node, is_push = operation.node, operation.is_push
-        if is_push:
+        operation = self._operations_by_time[time]
+        if operation.is_push:
+            if self._would_empty(time):
+                raise ValueError
+            node = operation.node
             if node.is_popped:
-                if node.prev is None:
-                    raise ValueError
-                node_to_pop = node.prev
-                while node_to_pop.is_popped:
-                    if node_to_pop.prev is None:
-                        raise ValueError
-                    node_to_pop = node_to_pop.prev
-                node_after = node.next
-                while node_after is not None and node_after.is_popped:
-                    node_after = node_after.next
-                node_to_pop.is_popped = True
-                if node_to_pop.prev is not None:
-                    node_to_pop.prev.next = node_after
-                if node_after is not None:
-                    node_after.prev = node_to_pop.prev
-            else:
-                node.is_popped = True
-                if node.prev is not None:
-                    node.prev.next = node.next
-                if node.next is not None:
-                    node.next.prev = node.prev
-                else:
-                    self.top = node.prev
+                node = self._push_after_prefix_at_most(time, self._weights.min_prefix_sum_from(time) - 1)
+            self._unlink(node)
+            self._remove_operation(operation)
         else:
-            node.is_popped = False
-            if node.next is not None:
-                next_node = node.next
-                while next_node.prev != node.prev:
-                    next_node = next_node.prev
-                next_node.prev = node
-                node.next = next_node
-            if node.prev is not None:
-                prev_node = node.prev
-                while prev_node.next != node.next:
-                    prev_node = prev_node.next
-                prev_node.next = node
-                node.prev = prev_node
-            if node.next is not None and node.next.is_popped:
-                self.top = node
-        self.operations.remove(operation)
+            self._remove_operation(operation)
+            self._link(self._push_after_prefix_at_most(time, self._weights.min_prefix_sum_from(time) - 1))
         return None
 
     def __iter__(self):
@@ -210,4 +339,4 @@ if __name__ == '__main__':
     print(prs)
     pop_operation = prs.get_top()
     print("Top value: " + str(pop_operation))
-    print(prs)
\ No newline at end of file
+    print(prs)
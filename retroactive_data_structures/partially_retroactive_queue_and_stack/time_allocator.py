@@ -0,0 +1,53 @@
+TIME_STEP = 2 ** 32
+
+
+def next_tuple_time(max_time):
+
+    """
+    A next_time policy for tuple time values: (0,) for the first operation, then TIME_STEP after the first component of
+    the maximum time, so every new operation leaves a wide gap for operations inserted later right before it.
+    """
+
+    return (0,) if max_time is None else (max_time[0] + TIME_STEP,)
+
+
+def time_between(before, after):
+
+    """
+    Returns a new tuple time value strictly between two tuple time values, without changing any existing time value.
+
+    The first component where the two times differ is split in the middle while there is room. When the gap there is
+    used up, a component is added, which again leaves a gap of TIME_STEP. Inserting right after the same operation
+    over and over, or right after the last inserted operation, therefore keeps the times short and takes O(1) time.
+    Only repeatedly splitting the newest gap, closing in on one point from both sides, adds a component about every
+    log2(TIME_STEP) insertions, which no scheme avoids without renumbering existing times.
+
+    Parameters:
+    - before: the time value to follow, or None if there is no lower bound
+    - after: the time value to precede, or None if there is no upper bound
+
+    Returns:
+    - A tuple of ints greater than before and less than after.
+
+    Raises:
+    - ValueError: if before is not less than after.
+    """
+
+    if before is None:
+        return (0,) if after is None else (after[0] - TIME_STEP,)
+    if after is None:
+        return (before[0] + TIME_STEP,)
+    if not before < after:
+        raise ValueError
+
+    index = 0
+    while index < len(before) and before[index] == after[index]:
+        index += 1
+    if index == len(before):
+        return before + (after[index] - TIME_STEP,)
+    if index < len(before) - 1:
+        return before[:-1] + (before[-1] + TIME_STEP,)
+    gap = after[index] - before[index]
+    if gap > 1:
+        return before[:index] + (before[index] + min(gap // 2, TIME_STEP),)
+    return before + (0,)
@@ -0,0 +1,161 @@
+import multiprocessing
+import os
+
+WRITE = 0
+READ = 1
+
+
+def _serve(connection, factory):
+
+    """
+    The loop of a shard process: keeps the structures of its keys, applies batches of (key, method, args) calls and
+    answers reads until it receives None. Structures are created with factory on the first update of their key; a read
+    of a key without updates is answered by an empty structure.
+    """
+
+    structures = {}
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        kind, calls = message
+        results = []
+        for index, (key, method, args) in enumerate(calls):
+            structure = structures.get(key)
+            if structure is None:
+                structure = factory()
+                if kind == WRITE:
+                    structures[key] = structure
+            try:
+                result = getattr(structure, method)(*args)
+            except Exception as error:
+                if kind == READ:
+                    result = error
+                else:
+                    results.append((index, error))
+                    continue
+            if kind == READ:
+                results.append(result)
+        connection.send(results)
+    connection.close()
+
+
+class RetroactiveShardManager():
+    """
+    Partitions independent retroactive structures, e.g. one PartiallyRetroactiveQueue per tenant, by key across a fixed
+    set of worker processes. Every process owns the structures of its keys, so updates of different shards run in
+    parallel. Update calls are buffered and sent to each process as one batch; reads send the buffered updates first,
+    so they see every submitted call.
+    """
+
+    def __init__(self, factory, processes=None):
+
+        """
+        Starts the worker processes.
+
+        Parameters:
+        - factory: A picklable callable that returns a new empty structure, e.g. PartiallyRetroactiveQueue.
+        - processes: The number of worker processes, by default the number of CPUs.
+        """
+
+        self.processes = processes or os.cpu_count() or 1
+        self._connections = []
+        self._workers = []
+        for _ in range(self.processes):
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_serve, args=(worker_connection, factory), daemon=True)
+            worker.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._workers.append(worker)
+        self._pending = [[] for _ in range(self.processes)]
+        self._failures = []
+
+    def _shard(self, key):
+        return hash(key) % self.processes
+
+    def submit(self, key, method, *args):
+
+        """
+        Buffers a call of the given method, e.g. 'insert_enqueue' or 'remove', on the structure of the key. The call is
+        applied by the next flush or read.
+        """
+
+        self._pending[self._shard(key)].append((key, method, args))
+
+    def _apply_pending(self):
+
+        """
+        Sends the buffered calls to their processes, one batch per process, waits until all are applied and keeps the
+        failed calls.
+        """
+
+        batches = [(shard, pending) for shard, pending in enumerate(self._pending) if pending]
+        self._pending = [[] for _ in range(self.processes)]
+        for shard, pending in batches:
+            self._connections[shard].send((WRITE, pending))
+        for shard, pending in batches:
+            for index, error in self._connections[shard].recv():
+                self._failures.append(pending[index] + (error,))
+
+    def flush(self):
+
+        """
+        Applies the buffered calls and returns the calls that failed since the last flush, as a list of
+        (key, method, args, error) tuples. A failed call does not stop the other calls of its batch.
+        """
+
+        self._apply_pending()
+        failures, self._failures = self._failures, []
+        return failures
+
+    def read_many(self, method, keys, *args):
+
+        """
+        Applies the buffered calls, then calls the given read method, e.g. 'get_first' or 'get_min', on the structures of
+        all keys in parallel. Returns a dict from key to result. A read that raises returns the exception as its result.
+        """
+
+        self._apply_pending()
+        by_shard = [[] for _ in range(self.processes)]
+        for key in keys:
+            by_shard[self._shard(key)].append((key, method, args))
+        for shard, calls in enumerate(by_shard):
+            if calls:
+                self._connections[shard].send((READ, calls))
+        results = {}
+        for shard, calls in enumerate(by_shard):
+            if calls:
+                for (key, _, _), result in zip(calls, self._connections[shard].recv()):
+                    results[key] = result
+        return results
+
+    def read(self, key, method, *args):
+
+        """
+        Applies the buffered calls and returns the result of the given read method on the structure of the key.
+        """
+
+        result = self.read_many(method, [key], *args)[key]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def close(self):
+
+        """
+        Applies the buffered calls and stops the worker processes.
+        """
+
+        self._apply_pending()
+        for connection in self._connections:
+            connection.send(None)
+            connection.close()
+        for worker in self._workers:
+            worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
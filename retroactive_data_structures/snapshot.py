@@ -0,0 +1,138 @@
+import array
+import mmap
+import pickle
+import struct
+
+MAGIC = b'RDS1'
+HEADER = struct.Struct('<4sB')
+COLUMN_HEADER = struct.Struct('<cQQ')
+ALIGNMENT = 8
+
+INT_MIN = -2 ** 63
+INT_MAX = 2 ** 63 - 1
+
+
+def _column_type(values):
+
+    """
+    Returns the typecode of the most compact encoding for a list of values: 'b' for bools, 'q' for ints that fit into
+    64 bits, 'd' for floats, 'n' if all values are None and 'o' (pickle) for anything else.
+    """
+
+    types = set(map(type, values))
+    if not types or types == {bool}:
+        return b'b'
+    if types == {int} and min(values) >= INT_MIN and max(values) <= INT_MAX:
+        return b'q'
+    if types == {float}:
+        return b'd'
+    if types == {type(None)}:
+        return b'n'
+    return b'o'
+
+
+def _encode_column(values):
+
+    """
+    Returns the typecode, the number of values and the bytes of a column.
+    """
+
+    typecode = _column_type(values)
+    if typecode == b'n':
+        return typecode, len(values), b''
+    if typecode == b'o':
+        return typecode, len(values), pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+    return typecode, len(values), array.array(typecode.decode(), values).tobytes()
+
+
+def save_columns(path, columns):
+
+    """
+    Writes columns of values to a file in a compact columnar binary layout: a header with the typecode, the length and
+    the size of every column, followed by the columns themselves, each aligned to 8 bytes. Bools, ints and floats are
+    stored as raw machine values, so the file can be memory-mapped and read without copying.
+
+    Parameters:
+    - path: the path of the file to write
+    - columns: a list of lists of values, which may have different lengths
+    """
+
+    encoded = [_encode_column(list(values)) for values in columns]
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, len(encoded)))
+        for typecode, length, data in encoded:
+            file.write(COLUMN_HEADER.pack(typecode, length, len(data)))
+        offset = HEADER.size + COLUMN_HEADER.size * len(encoded)
+        for _, _, data in encoded:
+            padding = -offset % ALIGNMENT
+            file.write(b'\0' * padding)
+            file.write(data)
+            offset += padding + len(data)
+
+
+class ColumnFile():
+    """
+    A file written by save_columns, memory-mapped for reading. Numeric columns are memoryviews into the mapped file,
+    so values are only materialized as Python objects while they are iterated.
+    """
+
+    def __init__(self, path):
+
+        """
+        Maps the file at the given path and reads the column headers.
+
+        Raises:
+        - ValueError: If the file was not written by save_columns.
+        """
+
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        magic, column_count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError
+        headers = [
+            COLUMN_HEADER.unpack_from(self._mmap, HEADER.size + COLUMN_HEADER.size * index)
+            for index in range(column_count)
+        ]
+        self._columns = []
+        offset = HEADER.size + COLUMN_HEADER.size * column_count
+        for typecode, length, size in headers:
+            offset += -offset % ALIGNMENT
+            self._columns.append((typecode, length, offset, size))
+            offset += size
+
+    def column(self, index):
+
+        """
+        Returns the column with the given index as a sequence of values.
+        """
+
+        typecode, length, offset, size = self._columns[index]
+        if typecode == b'n':
+            return [None] * length
+        if typecode == b'o':
+            return pickle.loads(self._mmap[offset:offset + size])
+        view = memoryview(self._mmap)[offset:offset + size].cast(typecode.decode())
+        self._views.append(view)
+        if typecode == b'b':
+            return map(bool, view)
+        return view
+
+    def close(self):
+
+        """
+        Releases the column views and unmaps the file.
+        """
+
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
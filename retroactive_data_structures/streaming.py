@@ -0,0 +1,97 @@
+import asyncio
+
+BATCH_SIZE = 256
+
+
+class AsyncFrontEnd():
+    """
+    An asyncio front-end for a retroactive structure. Operations received from an async iterator are collected into
+    micro-batches and applied with the apply_batch method of the structure, and the event loop gets control back after
+    every batch. Reads apply the pending operations first, so they always see every operation consumed so far.
+    """
+
+    def __init__(self, structure, batch_size=BATCH_SIZE):
+
+        """
+        Parameters:
+        - structure: The structure to update, e.g. a PartiallyRetroactiveQueue.
+        - batch_size: The number of operations applied together.
+        """
+
+        self.structure = structure
+        self.batch_size = batch_size
+        self._pending = []
+
+    def _flush(self):
+
+        """
+        Applies the pending operations as one batch.
+        """
+
+        if self._pending:
+            batch, self._pending = self._pending, []
+            self.structure.apply_batch(batch)
+
+    async def consume(self, operations):
+
+        """
+        Applies operations from an async iterable, in the format of the apply_batch method of the structure, in batches of
+        batch_size. An error raised by apply_batch stops consuming; the operations of the failed batch are not applied.
+        Returns the number of consumed operations.
+        """
+
+        count = 0
+        async for operation in operations:
+            self._pending.append(operation)
+            count += 1
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+                await asyncio.sleep(0)
+        self._flush()
+        return count
+
+    async def flush(self):
+
+        """
+        Applies the pending operations.
+        """
+
+        self._flush()
+
+
+class AsyncQueue(AsyncFrontEnd):
+    async def first(self):
+        self._flush()
+        return self.structure.get_first()
+
+    async def last(self):
+        self._flush()
+        return self.structure.get_last()
+
+    async def delete_operation(self, time):
+        self._flush()
+        self.structure.delete_operation(time)
+
+
+class AsyncStack(AsyncFrontEnd):
+    async def top(self):
+        self._flush()
+        return self.structure.get_top()
+
+    async def delete_operation(self, time):
+        self._flush()
+        self.structure.delete_operation(time)
+
+
+class AsyncPriorityQueue(AsyncFrontEnd):
+    async def min(self):
+        self._flush()
+        return self.structure.get_min()
+
+    async def peek_k(self, k):
+        self._flush()
+        return self.structure.peek_k(k)
+
+    async def remove(self, time):
+        self._flush()
+        self.structure.remove(time)
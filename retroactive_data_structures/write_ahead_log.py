@@ -0,0 +1,152 @@
+import os
+import pickle
+import struct
+import zlib
+
+RECORD_HEADER = struct.Struct('<BII')
+INSERT = 1
+DELETE = 2
+GROUP_SIZE = 256
+
+
+class WriteAheadLog():
+    """
+    An append-only log of retroactive operations. Records are appended to an in-memory buffer, which is written to the
+    file and fsynced once for every group_size records (group commit), or when commit or close is called. Every record
+    is a header with its type, the size and the CRC32 of its payload, followed by the pickled payload.
+    """
+
+    def __init__(self, path, group_size=GROUP_SIZE):
+
+        """
+        Opens the log at the given path for appending, creating it if it does not exist. An incomplete or corrupted
+        record that a crash left at the end of the log is cut off first, so that new records are appended right after the
+        last valid record and can be read back.
+
+        Parameters:
+        - path: The path of the log file.
+        - group_size: The number of records written and fsynced together. With group_size=1 every record is durable as
+          soon as it is logged.
+        """
+
+        self._file = open(path, 'ab')
+        with open(path, 'rb') as file:
+            valid_length = _valid_length(file.read())
+        if valid_length < self._file.tell():
+            self._file.truncate(valid_length)
+            os.fsync(self._file.fileno())
+        self._buffer = bytearray()
+        self._pending = 0
+        self.group_size = group_size
+
+    def _append(self, record_type, payload):
+        data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        self._buffer += RECORD_HEADER.pack(record_type, len(data), zlib.crc32(data))
+        self._buffer += data
+        self._pending += 1
+        if self._pending >= self.group_size:
+            self.commit()
+
+    def log_insert(self, time, is_insert, value=None, data=None):
+
+        """
+        Logs an added operation: an enqueue, push or insert if is_insert is True, otherwise a dequeue, pop or delete-min.
+        """
+
+        self._append(INSERT, (time, is_insert, value, data))
+
+    def log_delete(self, time):
+
+        """
+        Logs the removal of the operation at the given time.
+        """
+
+        self._append(DELETE, time)
+
+    def commit(self):
+
+        """
+        Writes the buffered records to the file and fsyncs it.
+        """
+
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._buffer = bytearray()
+        self._pending = 0
+
+    def close(self):
+
+        """
+        Commits the buffered records and closes the file.
+        """
+
+        self.commit()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _scan_records(content):
+
+    """
+    Yields the record type, the pickled payload and the end offset of every record in the content of a log. Scanning
+    stops at the first incomplete or corrupted record, which is what a crash in the middle of a write leaves at the end
+    of the log.
+    """
+
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(content):
+        record_type, size, checksum = RECORD_HEADER.unpack_from(content, offset)
+        start = offset + RECORD_HEADER.size
+        data = content[start:start + size]
+        if len(data) < size or zlib.crc32(data) != checksum:
+            return
+        offset = start + size
+        yield record_type, data, offset
+
+
+def _valid_length(content):
+
+    """
+    Returns the length of the content of a log up to the end of its last valid record.
+    """
+
+    end = 0
+    for _, _, end in _scan_records(content):
+        pass
+    return end
+
+
+def read_records(path):
+
+    """
+    Yields the (record_type, payload) records of a log in the order they were logged. Reading stops at the first
+    incomplete or corrupted record.
+    """
+
+    with open(path, 'rb') as file:
+        content = file.read()
+    for record_type, data, _ in _scan_records(content):
+        yield record_type, pickle.loads(data)
+
+
+def read_operations(path):
+
+    """
+    Returns the operations of a log that were not removed afterwards, as a time sorted list of
+    (time, is_insert, value, data) tuples, ready for a bulk build.
+    """
+
+    operations = {}
+    for record_type, payload in read_records(path):
+        if record_type == INSERT:
+            operations[payload[0]] = payload
+        else:
+            operations.pop(payload, None)
+    return [operations[time] for time in sorted(operations)]
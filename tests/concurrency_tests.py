@@ -0,0 +1,70 @@
+import threading
+import unittest
+from retroactive_data_structures.concurrency import ConcurrentPriorityQueue, ConcurrentQueue, ConcurrentStack, ReadWriteLock
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_queue import PartiallyRetroactiveQueue
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_stack import PartiallyRetroactiveStack
+from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import PartiallyRetroactivePriorityQueue
+
+
+class ConcurrencyTests(unittest.TestCase):
+
+    def test_queue_present_state(self):
+        queue = ConcurrentQueue(PartiallyRetroactiveQueue())
+        queue.insert_enqueue(value=2, time=10)
+        queue.insert_enqueue(value=4, time=20)
+        queue.insert_dequeue(time=15)
+        queue.apply_batch([(5, True, 8)])
+
+        self.assertEqual((queue.get_first(), queue.get_last()), (2, 4))
+        self.assertEqual(queue.read(str), "Queue = [2, 4]\t\t(First=2, Last=4)")
+
+    def test_failed_write_publishes_state(self):
+        stack = ConcurrentStack(PartiallyRetroactiveStack())
+        stack.insert_push(value=2, time=10)
+
+        self.assertRaises(ValueError, stack.insert_push, 4, 10)
+        self.assertEqual(stack.get_top(), 2)
+
+    def test_readers_during_writes(self):
+        priority_queue = ConcurrentPriorityQueue(PartiallyRetroactivePriorityQueue())
+        priority_queue.add_insert(0, 0, None)
+        done = threading.Event()
+        errors = []
+
+        def read():
+            while not done.is_set():
+                minimum = priority_queue.get_min()
+                smallest = priority_queue.read(lambda structure: structure.peek_k(1))
+                if minimum[0] != 0 or smallest[0][0] != 0:
+                    errors.append((minimum, smallest))
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for time in range(1, 2000):
+            priority_queue.add_insert(time, 2000 - time, None)
+            if time % 3 == 0:
+                priority_queue.remove(time)
+        done.set()
+        for reader in readers:
+            reader.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(priority_queue.read(len), 1334)
+
+    def test_writer_excludes_readers(self):
+        lock = ReadWriteLock()
+        events = []
+
+        def read():
+            with lock.reading():
+                events.append('read')
+
+        with lock.writing():
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(0.05)
+            events.append('write')
+        reader.join()
+
+        self.assertEqual(events, ['write', 'read'])
@@ -0,0 +1,102 @@
+import heapq
+import random
+import unittest
+from retroactive_data_structures.fully_retroactive_priority_queue.fully_retroactive_priority_queue import \
+    FullyRetroactivePriorityQueue
+
+
+def replay(operations, until=None):
+
+    """
+    Applies the (is_insert, value) operations of a {time: operation} dict up to the given time to a binary heap, storing
+    every value with its time as data, and returns the sorted (value, data) elements, or None if a delete-min finds the
+    heap empty.
+    """
+
+    heap = []
+    for time in sorted(operations):
+        if until is not None and time > until:
+            break
+        is_insert, value = operations[time]
+        if is_insert:
+            heapq.heappush(heap, (value, time))
+        elif not heap:
+            return None
+        else:
+            heapq.heappop(heap)
+    return sorted(heap)
+
+
+class FullyRetroactivePriorityQueueTests(unittest.TestCase):
+
+    def test_queries_at_time(self):
+        frpq = FullyRetroactivePriorityQueue()
+        frpq.add_insert(10, 4, '4')
+        frpq.add_insert(20, 6, '6')
+        frpq.add_insert(15, 1, '1')
+        frpq.add_delete_min(16)
+
+        self.assertEqual(str(frpq), "PriorityQueue = [4, 6]")
+        self.assertEqual([frpq.min_at(t) for t in [5, 10, 15, 16, 20]], [None, (4, '4'), (1, '1'), (4, '4'), (4, '4')])
+        self.assertEqual(frpq.contents_at(15), [(1, '1'), (4, '4')])
+        self.assertEqual([frpq.size_at(t) for t in [5, 10, 15, 16, 20]], [0, 1, 2, 1, 2])
+
+    def test_existing_time(self):
+        frpq = FullyRetroactivePriorityQueue()
+        frpq.add_insert(10, 4, '4')
+
+        self.assertRaises(KeyError, frpq.add_insert, 10, 5, '5')
+        self.assertRaises(KeyError, frpq.add_delete_min, 10)
+        self.assertRaises(KeyError, frpq.remove, 20)
+
+    def test_delete_min_empty(self):
+        frpq = FullyRetroactivePriorityQueue()
+        frpq.add_insert(10, 4, '4')
+        frpq.add_delete_min(20)
+
+        self.assertRaises(ValueError, frpq.add_delete_min, 5)
+        self.assertRaises(ValueError, frpq.add_delete_min, 15)
+        self.assertRaises(ValueError, frpq.remove, 10)
+
+    def test_checkpoints(self):
+        frpq = FullyRetroactivePriorityQueue()
+        for time in range(1000):
+            frpq.add_insert(2 * time, 1000 - time, str(time))
+        frpq.add_delete_min(1001)
+        frpq.remove(1000)
+
+        self.assertGreater(len(frpq._checkpoints), 1)
+        self.assertEqual(frpq.min_at(999), (501, '499'))
+        self.assertEqual(frpq.min_at(1001), (502, '498'))
+        self.assertEqual(frpq.min_at(1002), (499, '501'))
+        self.assertEqual(frpq.get_min(), (1, '999'))
+
+    def test_matches_replay(self):
+        for seed in range(5):
+            rng = random.Random(seed)
+            frpq = FullyRetroactivePriorityQueue()
+            operations = {}
+            for _ in range(400):
+                time = rng.randrange(2000)
+                if time in operations:
+                    operation = operations.pop(time)
+                    if replay(operations) is None:
+                        self.assertRaises(ValueError, frpq.remove, time)
+                        operations[time] = operation
+                    else:
+                        frpq.remove(time)
+                elif rng.random() < 0.6:
+                    operations[time] = (True, rng.randrange(100))
+                    frpq.add_insert(time, operations[time][1], time)
+                else:
+                    operations[time] = (False, None)
+                    if replay(operations) is None:
+                        self.assertRaises(ValueError, frpq.add_delete_min, time)
+                        del operations[time]
+                    else:
+                        frpq.add_delete_min(time)
+
+            self.assertGreater(len(frpq._checkpoints), 1)
+            for time in range(0, 2000, 37):
+                self.assertEqual(frpq.contents_at(time), replay(operations, time))
+                self.assertEqual(frpq.size_at(time), len(replay(operations, time)))
@@ -0,0 +1,81 @@
+import unittest
+from retroactive_data_structures.fully_retroactive_queue_and_stack.fully_retroactive_queue import FullyRetroactiveQueue
+
+
+class FullyRetroactiveQueueTests(unittest.TestCase):
+
+    def test_insert_enqueue(self):
+        frq = FullyRetroactiveQueue()
+        frq.insert_enqueue(value=2, time=10)
+        frq.insert_enqueue(value=4, time=20)
+        frq.insert_enqueue(value=6, time=30)
+
+        self.assertEqual(str(frq), "Queue = [2, 4, 6]\t\t(First=2, Last=6)")
+
+    def test_insert_dequeue(self):
+        frq = FullyRetroactiveQueue()
+        frq.insert_enqueue(value=2, time=10)
+        frq.insert_enqueue(value=4, time=20)
+        frq.insert_enqueue(value=6, time=30)
+        frq.insert_dequeue(time=28)
+        frq.insert_enqueue(value=8, time=15)
+
+        self.assertEqual(str(frq), "Queue = [8, 4, 6]\t\t(First=8, Last=6)")
+
+    def test_insert_dequeue_empty(self):
+        frq = FullyRetroactiveQueue()
+        frq.insert_enqueue(value=2, time=10)
+
+        self.assertRaises(ValueError, frq.insert_dequeue, 5)
+
+    def test_insert_dequeue_empties_later_dequeue(self):
+        frq = FullyRetroactiveQueue()
+        frq.insert_enqueue(value='a', time=10)
+        frq.insert_dequeue(time=20)
+        frq.insert_enqueue(value='b', time=30)
+
+        self.assertRaises(ValueError, frq.insert_dequeue, 15)
+        self.assertEqual(frq.front_at(30), 'b')
+        self.assertEqual(frq.size_at(30), 1)
+
+    def test_delete_enqueue_empties_later_dequeue(self):
+        frq = FullyRetroactiveQueue()
+        frq.insert_enqueue(value='a', time=10)
+        frq.insert_dequeue(time=20)
+        frq.insert_enqueue(value='b', time=30)
+
+        self.assertRaises(ValueError, frq.delete_operation, 10)
+        self.assertEqual(str(frq), "Queue = [b]\t\t(First=b, Last=b)")
+
+    def test_delete_operation(self):
+        frq = FullyRetroactiveQueue()
+        frq.insert_enqueue(value=2, time=10)
+        frq.insert_enqueue(value=4, time=20)
+        frq.insert_dequeue(time=28)
+        frq.delete_operation(time=28)
+
+        self.assertEqual(str(frq), "Queue = [2, 4]\t\t(First=2, Last=4)")
+        self.assertRaises(ValueError, frq.delete_operation, 28)
+
+    def test_queries_at_time(self):
+        frq = FullyRetroactiveQueue()
+        frq.insert_enqueue(value=2, time=10)
+        frq.insert_enqueue(value=4, time=20)
+        frq.insert_enqueue(value=6, time=30)
+        frq.insert_dequeue(time=25)
+        frq.insert_dequeue(time=35)
+
+        self.assertEqual([frq.front_at(t) for t in [5, 10, 20, 25, 30, 35]], [None, 2, 2, 4, 4, 6])
+        self.assertEqual([frq.back_at(t) for t in [5, 10, 20, 25, 30, 35]], [None, 2, 4, 4, 6, 6])
+        self.assertEqual([frq.size_at(t) for t in [5, 10, 20, 25, 30, 35]], [0, 1, 2, 1, 2, 1])
+
+    def test_float_times(self):
+        frq = FullyRetroactiveQueue()
+        frq.insert_enqueue(value=2, time=0.5)
+        frq.insert_enqueue(value=4, time=1.25)
+        frq.insert_dequeue(time=1.0)
+        frq.insert_enqueue(value=6)
+
+        self.assertEqual(frq.get_max_time(), 11.25)
+        self.assertEqual(frq.front_at(0.75), 2)
+        self.assertEqual(str(frq), "Queue = [4, 6]\t\t(First=4, Last=6)")
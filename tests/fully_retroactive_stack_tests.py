@@ -0,0 +1,54 @@
+import unittest
+from retroactive_data_structures.fully_retroactive_queue_and_stack.fully_retroactive_stack import FullyRetroactiveStack
+
+
+class FullyRetroactiveStackTests(unittest.TestCase):
+
+    def test_insert_push(self):
+        frs = FullyRetroactiveStack()
+        frs.insert_push(value=2, time=10)
+        frs.insert_push(value=4, time=20)
+        frs.insert_push(value=6, time=30)
+
+        self.assertEqual(str(frs), "Stack = [6, 4, 2]\t\t(Top=6)")
+
+    def test_insert_pop(self):
+        frs = FullyRetroactiveStack()
+        frs.insert_push(value=2, time=10)
+        frs.insert_push(value=4, time=20)
+        frs.insert_push(value=6, time=30)
+        frs.insert_pop(time=28)
+        frs.insert_push(value=8, time=15)
+
+        self.assertEqual(str(frs), "Stack = [6, 8, 2]\t\t(Top=6)")
+
+    def test_insert_pop_empty(self):
+        frs = FullyRetroactiveStack()
+        frs.insert_push(value=2, time=10)
+        frs.insert_pop(time=20)
+
+        self.assertRaises(ValueError, frs.insert_pop, 5)
+        self.assertRaises(ValueError, frs.insert_pop, 15)
+
+    def test_delete_operation(self):
+        frs = FullyRetroactiveStack()
+        frs.insert_push(value=2, time=10)
+        frs.insert_push(value=4, time=20)
+        frs.insert_pop(time=30)
+
+        self.assertRaises(ValueError, frs.delete_operation, 25)
+        frs.delete_operation(time=10)
+        self.assertEqual(str(frs), "Stack = []\t\t(Top=None)")
+        self.assertRaises(ValueError, frs.delete_operation, 20)
+
+    def test_queries_at_time(self):
+        frs = FullyRetroactiveStack()
+        frs.insert_push(value=2, time=10)
+        frs.insert_push(value=4, time=20)
+        frs.insert_pop(time=25)
+        frs.insert_push(value=6, time=30)
+        frs.insert_pop(time=35)
+        frs.insert_pop(time=40)
+
+        self.assertEqual([frs.top_at(t) for t in [5, 10, 20, 25, 30, 35, 40]], [None, 2, 4, 2, 6, 2, None])
+        self.assertEqual([frs.size_at(t) for t in [5, 10, 20, 25, 30, 35, 40]], [0, 1, 2, 1, 2, 1, 0])
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import PartiallyRetroactivePriorityQueue
 
@@ -65,3 +67,111 @@ class PartiallyRetroactivePriorityQueueTests(unittest.TestCase):
         length = len(prpq)
 
         self.assertEqual(length, 4)
+
+    def test_apply_batch(self):
+        prpq = PartiallyRetroactivePriorityQueue()
+        prpq.apply_batch([(10, True, 2, "2"), (30, True, 4, "4"), (20, True, 6, "6"), (40, True, 10, "10")])
+        prpq.apply_batch([(29, False, None, None), (28, False, None, None), (15, True, 1, "1")])
+
+        self.assertEqual(str(prpq), "PriorityQueue = [4, 6, 10]")
+
+    def test_apply_batch_one_by_one(self):
+        prpq = PartiallyRetroactivePriorityQueue()
+        prpq.add_insert(10, 2, "2")
+        prpq.add_insert(20, 6, "6")
+        prpq.add_insert(30, 4, "4")
+        prpq.add_insert(40, 10, "10")
+        prpq.apply_batch([(29, False, None, None)])
+
+        self.assertEqual(str(prpq), "PriorityQueue = [4, 6, 10]")
+
+    def test_apply_batch_fails_mid_batch(self):
+        prpq = PartiallyRetroactivePriorityQueue()
+        for time in range(10, 170, 10):
+            prpq.add_insert(time, time, str(time))
+        timeline = list(prpq._timeline())
+
+        self.assertRaises(ValueError, prpq.apply_batch, [(1, True, 1, "1"), (2, False, None, None), (3, False, None, None)])
+        self.assertEqual(list(prpq._timeline()), timeline)
+        self.assertEqual(len(prpq), 16)
+        self.assertEqual(prpq.get_min(), (10, "10"))
+
+    def test_apply_batch_existing_time(self):
+        prpq = PartiallyRetroactivePriorityQueue()
+        prpq.add_insert(10, 2, "2")
+
+        self.assertRaises(KeyError, prpq.apply_batch, [(10, True, 4, "4")])
+
+    def test_equal_values(self):
+        prpq = PartiallyRetroactivePriorityQueue()
+        prpq.add_insert(10, 2, "a")
+        prpq.add_insert(20, 2, "b")
+        prpq.add_insert(30, 2, "c")
+        prpq.add_insert(5, 2, "d")
+        prpq.add_delete_min(25)
+
+        self.assertEqual(list(prpq), [(2, "a"), (2, "b"), (2, "c")])
+        self.assertEqual(prpq.get_min(), (2, "a"))
+
+        prpq.remove(20)
+
+        self.assertEqual(list(prpq), [(2, "a"), (2, "c")])
+        self.assertIn(2, prpq)
+        self.assertNotIn(3, prpq)
+
+    def test_get_min_after_delete_min(self):
+        prpq = PartiallyRetroactivePriorityQueue()
+        prpq.add_insert(10, 2, "2")
+        prpq.add_insert(20, 6, "6")
+        prpq.add_insert(30, 4, "4")
+        prpq.add_delete_min(25)
+
+        self.assertEqual(prpq.get_min(), (4, "4"))
+
+        prpq.remove(25)
+
+        self.assertEqual(prpq.get_min(), (2, "2"))
+
+        prpq.remove(10)
+        prpq.remove(20)
+        prpq.remove(30)
+
+        self.assertEqual(prpq.get_min(), None)
+
+    def test_peek_k(self):
+        prpq = PartiallyRetroactivePriorityQueue()
+        prpq.add_insert(10, 2, "2")
+        prpq.add_insert(20, 6, "6")
+        prpq.add_insert(30, 4, "4")
+        prpq.add_insert(40, 10, "10")
+
+        self.assertEqual(prpq.peek_k(2), [(2, "2"), (4, "4")])
+        self.assertEqual(prpq.peek_k(10), [(2, "2"), (4, "4"), (6, "6"), (10, "10")])
+
+    def test_save_load(self):
+        prpq = PartiallyRetroactivePriorityQueue()
+        prpq.add_insert(10, 2, "2")
+        prpq.add_insert(20, 6, "6")
+        prpq.add_insert(30, 4, "4")
+        prpq.add_delete_min(25)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'priority_queue.bin')
+            prpq.save(path)
+            loaded = PartiallyRetroactivePriorityQueue.load(path)
+
+        self.assertEqual(loaded.peek_k(10), [(4, "4"), (6, "6")])
+        loaded.remove(25)
+        self.assertEqual(loaded.get_min(), (2, "2"))
+
+    def test_snapshot(self):
+        for persistent in [False, True]:
+            prpq = PartiallyRetroactivePriorityQueue(persistent=persistent)
+            prpq.add_insert(10, 2, "2")
+            prpq.add_insert(20, 6, "6")
+            snapshot = prpq.snapshot()
+            prpq.add_delete_min(25)
+            prpq.add_insert(30, 4, "4")
+            snapshot.add_insert(5, 1, "1")
+
+            self.assertEqual(prpq.peek_k(10), [(4, "4"), (6, "6")])
+            self.assertEqual(snapshot.peek_k(10), [(1, "1"), (2, "2"), (6, "6")])
@@ -1,5 +1,28 @@
+import os
+import random
+import tempfile
 import unittest
 from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_queue import PartiallyRetroactiveQueue
+from retroactive_data_structures.partially_retroactive_queue_and_stack.time_allocator import next_tuple_time
+
+
+def replay(operations):
+
+    """
+    Applies the (is_enqueue, value) operations of a {time: operation} dict in time order to a list and returns it, or
+    None if a dequeue finds the queue empty.
+    """
+
+    queue = []
+    for time in sorted(operations):
+        is_enqueue, value = operations[time]
+        if is_enqueue:
+            queue.append(value)
+        elif not queue:
+            return None
+        else:
+            queue.pop(0)
+    return queue
 
 
 class PartiallyRetroactiveQueueTests(unittest.TestCase):
@@ -51,3 +74,218 @@ class PartiallyRetroactiveQueueTests(unittest.TestCase):
 
         self.assertEqual(last_value, 6)
 
+
+    def test_insert_enqueue_existing_time(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.insert_enqueue(value=2, time=10)
+
+        self.assertRaises(ValueError, prq.insert_enqueue, 4, 10)
+
+    def test_insert_enqueue_retroactive(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.insert_enqueue(value=2, time=10)
+        prq.insert_enqueue(value=4, time=20)
+        prq.insert_enqueue(value=6, time=30)
+        prq.insert_dequeue(time=28)
+        prq.insert_enqueue(value=8, time=15)
+
+        self.assertEqual(str(prq), "Queue = [8, 4, 6]\t\t(First=8, Last=6)")
+
+    def test_delete_dequeue_after_retroactive_enqueue(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.insert_enqueue(value=8, time=8)
+        prq.insert_enqueue(value=11, time=11)
+        prq.insert_dequeue(time=13)
+        prq.insert_enqueue(value=2, time=2)
+        prq.delete_operation(time=13)
+
+        self.assertEqual(str(prq), "Queue = [2, 8, 11]\t\t(First=2, Last=11)")
+
+    def test_insert_enqueue_retroactive_after_emptied(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.insert_enqueue(value=10, time=10)
+        prq.insert_dequeue(time=20)
+        prq.insert_enqueue(value=5, time=5)
+
+        self.assertEqual(str(prq), "Queue = [10]\t\t(First=10, Last=10)")
+
+    def test_insert_enqueue_retroactive_after_refilled(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.insert_enqueue(value=10, time=10)
+        prq.insert_dequeue(time=20)
+        prq.insert_enqueue(value=30, time=30)
+        prq.insert_enqueue(value=5, time=5)
+
+        self.assertEqual(str(prq), "Queue = [10, 30]\t\t(First=10, Last=30)")
+
+    def test_insert_enqueue_before_dequeue(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.insert_enqueue(value=61, time=11)
+        prq.insert_dequeue(time=75)
+        prq.insert_enqueue(value=57, time=45)
+
+        self.assertEqual(str(prq), "Queue = [57]\t\t(First=57, Last=57)")
+
+    def test_insert_enqueue_between_dequeues(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.insert_enqueue(value=1, time=10)
+        prq.insert_enqueue(value=2, time=20)
+        prq.insert_dequeue(time=30)
+        prq.insert_enqueue(value=3, time=40)
+        prq.insert_enqueue(value=9, time=25)
+
+        self.assertEqual(str(prq), "Queue = [2, 9, 3]\t\t(First=2, Last=3)")
+        self.assertEqual(prq._find_operation(30).node.value, 1)
+
+    def test_insert_dequeue_on_empty_queue(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.insert_enqueue(value=1, time=10)
+
+        self.assertIsNone(prq.insert_dequeue(time=5))
+        self.assertEqual(str(prq), "Queue = [1]\t\t(First=1, Last=1)")
+
+    def test_matches_replay(self):
+        for seed in range(50):
+            rng = random.Random(seed)
+            prq = PartiallyRetroactiveQueue()
+            operations = {}
+            for _ in range(60):
+                time = rng.randrange(100)
+                choice = rng.random()
+                if choice < 0.8 and time in operations:
+                    continue
+                if choice < 0.45:
+                    prq.insert_enqueue(value=time, time=time)
+                    operations[time] = (True, time)
+                elif choice < 0.8:
+                    expected = replay({**operations, time: (False, None)})
+                    self.assertEqual(prq.insert_dequeue(time=time) is None, expected is None)
+                    if expected is not None:
+                        operations[time] = (False, None)
+                elif operations:
+                    time = rng.choice(sorted(operations))
+                    remaining = {key: value for key, value in operations.items() if key != time}
+                    if replay(remaining) is None:
+                        self.assertRaises(ValueError, prq.delete_operation, time)
+                    else:
+                        prq.delete_operation(time=time)
+                        operations = remaining
+
+                expected = replay(operations)
+                self.assertEqual([node.value for node in prq], expected)
+                self.assertEqual(prq.get_first(), expected[0] if expected else None)
+                self.assertEqual(prq.get_last(), expected[-1] if expected else None)
+
+    def test_delete_operation_missing_time(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.insert_enqueue(value=2, time=10)
+
+        self.assertRaises(ValueError, prq.delete_operation, 20)
+
+    def test_from_operations(self):
+        prq = PartiallyRetroactiveQueue.from_operations([
+            (10, True, 2), (15, True, 8), (20, True, 4), (28, False, None), (30, True, 6)
+        ])
+        prq.insert_enqueue(value=1, time=5)
+
+        self.assertEqual(str(prq), "Queue = [2, 8, 4, 6]\t\t(First=2, Last=6)")
+        self.assertEqual(prq.get_max_time(), 30)
+
+    def test_from_operations_unsorted(self):
+        prq = PartiallyRetroactiveQueue.from_operations(
+            [(30, True, 6), (28, False, None), (10, True, 2), (20, True, 4)], is_sorted=False
+        )
+
+        self.assertEqual(str(prq), "Queue = [4, 6]\t\t(First=4, Last=6)")
+
+    def test_from_operations_not_sorted(self):
+        self.assertRaises(ValueError, PartiallyRetroactiveQueue.from_operations, [(20, True, 4), (10, True, 2)])
+
+    def test_apply_batch(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.insert_enqueue(value=2, time=10)
+        prq.insert_enqueue(value=4, time=20)
+        prq.insert_enqueue(value=6, time=30)
+        prq.apply_batch([(28, False, None), (15, True, 8), (5, True, 1), (16, False, None)])
+
+        self.assertEqual(str(prq), "Queue = [8, 4, 6]\t\t(First=8, Last=6)")
+
+    def test_apply_batch_matches_one_by_one(self):
+        operations = [(1, False, None), (3, True, 'a'), (2, True, 'b'), (4, False, None), (0, True, 'c')]
+        batched = PartiallyRetroactiveQueue()
+        batched.apply_batch(operations)
+        one_by_one = PartiallyRetroactiveQueue()
+        for time, is_enqueue, value in sorted(operations, key=lambda operation: operation[0]):
+            if is_enqueue:
+                one_by_one.insert_enqueue(value, time)
+            else:
+                one_by_one.insert_dequeue(time)
+
+        self.assertEqual(str(batched), str(one_by_one))
+        self.assertEqual(str(batched), str(PartiallyRetroactiveQueue.from_operations(sorted(operations))))
+
+    def test_apply_batch_small_and_large(self):
+        history = [(time, time % 30 != 0, time) for time in range(10, 400, 10)]
+        for batch in [[(25, False, None), (5, True, 'a'), (395, False, None)],
+                      [(time, time % 4 == 1, time) for time in range(5, 400, 4)]]:
+            batched = PartiallyRetroactiveQueue.from_operations(history)
+            batched.apply_batch(batch)
+            one_by_one = PartiallyRetroactiveQueue.from_operations(history)
+            for time, is_enqueue, value in sorted(batch, key=lambda operation: operation[0]):
+                if is_enqueue:
+                    one_by_one.insert_enqueue(value, time)
+                else:
+                    one_by_one.insert_dequeue(time)
+
+            self.assertEqual(str(batched), str(one_by_one))
+            self.assertEqual([time for time, _ in batched.operations], [time for time, _ in one_by_one.operations])
+
+    def test_apply_batch_dequeue_before_enqueue(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.apply_batch([(1, False, None), (3, True, 'a')])
+
+        self.assertEqual(str(prq), "Queue = [a]\t\t(First=a, Last=a)")
+
+    def test_apply_batch_existing_time(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.insert_enqueue(value=2, time=10)
+
+        self.assertRaises(ValueError, prq.apply_batch, [(5, True, 1), (10, True, 4)])
+        self.assertEqual(str(prq), "Queue = [2]\t\t(First=2, Last=2)")
+
+    def test_tuple_times(self):
+        prq = PartiallyRetroactiveQueue(next_time=lambda time: (0, 0) if time is None else (time[0], time[1] + 1))
+        prq.insert_enqueue(value=2)
+        prq.insert_enqueue(value=4)
+        prq.insert_enqueue(value=6, time=(0, 0, 5))
+        prq.insert_dequeue()
+
+        self.assertEqual(prq.get_max_time(), (0, 2))
+        self.assertEqual(str(prq), "Queue = [6, 4]\t\t(First=6, Last=4)")
+
+    def test_time_after(self):
+        prq = PartiallyRetroactiveQueue(next_time=next_tuple_time)
+        first = prq.insert_enqueue(value=2)
+        prq.insert_enqueue(value=6)
+        time = first.time
+        for value in [3, 4, 5]:
+            time = prq.time_after(time)
+            prq.insert_enqueue(value=value, time=time)
+
+        self.assertEqual(str(prq), "Queue = [2, 3, 4, 5, 6]\t\t(First=2, Last=6)")
+
+    def test_save_load(self):
+        prq = PartiallyRetroactiveQueue()
+        prq.insert_enqueue(value=2, time=10)
+        prq.insert_enqueue(value=4, time=20)
+        prq.insert_enqueue(value=6, time=30)
+        prq.insert_dequeue(time=28)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'queue.bin')
+            prq.save(path)
+            loaded = PartiallyRetroactiveQueue.load(path)
+
+        self.assertEqual(str(loaded), "Queue = [4, 6]\t\t(First=4, Last=6)")
+        loaded.insert_enqueue(value=8, time=15)
+        loaded.delete_operation(time=28)
+        self.assertEqual(str(loaded), "Queue = [2, 8, 4, 6]\t\t(First=2, Last=6)")
@@ -1,7 +1,30 @@
+import os
+import random
+import tempfile
+import datetime
 import unittest
 from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_stack import PartiallyRetroactiveStack
 
 
+def replay(operations):
+
+    """
+    Applies the (is_push, value) operations of a {time: operation} dict in time order to a list and returns the list and
+    a {pop time: popped value} dict, or None if a pop finds the stack empty.
+    """
+
+    stack, popped = [], {}
+    for time in sorted(operations):
+        is_push, value = operations[time]
+        if is_push:
+            stack.append(value)
+        elif not stack:
+            return None
+        else:
+            popped[time] = stack.pop()
+    return stack, popped
+
+
 class PartiallyRetroactiveStackTests(unittest.TestCase):
 
     def test_insert_push(self):
@@ -39,4 +62,138 @@ class PartiallyRetroactiveStackTests(unittest.TestCase):
 
         top_value = prs.get_top()
 
-        self.assertEqual(top_value, 6)
\ No newline at end of file
+        self.assertEqual(top_value, 6)
+
+    def test_insert_push_existing_time(self):
+        prs = PartiallyRetroactiveStack()
+        prs.insert_push(value=2, time=10)
+
+        self.assertRaises(ValueError, prs.insert_push, 4, 10)
+
+    def test_from_operations(self):
+        prs = PartiallyRetroactiveStack.from_operations(
+            (time, True, time // 10) for time in range(10, 50, 10)
+        )
+        prs.insert_pop(time=25)
+
+        self.assertEqual(str(prs), "Stack = [4, 3, 1]\t\t(Top=4)")
+
+    def test_apply_batch(self):
+        prs = PartiallyRetroactiveStack()
+        prs.insert_push(value=2, time=10)
+        prs.insert_push(value=4, time=20)
+        prs.insert_push(value=6, time=30)
+        prs.apply_batch([(28, False, None), (15, True, 8)])
+
+        self.assertEqual(str(prs), "Stack = [6, 8, 2]\t\t(Top=6)")
+
+    def test_apply_batch_matches_one_by_one(self):
+        history = [(time, time % 30 != 0, time) for time in range(10, 400, 10)]
+        for batch in [[(25, False, None), (5, True, 'a'), (395, False, None)],
+                      [(time, time % 4 == 1, time) for time in range(5, 400, 4)]]:
+            batched = PartiallyRetroactiveStack.from_operations(history)
+            batched.apply_batch(batch)
+            one_by_one = PartiallyRetroactiveStack.from_operations(history)
+            for time, is_push, value in sorted(batch, key=lambda operation: operation[0]):
+                if is_push:
+                    one_by_one.insert_push(value, time)
+                else:
+                    one_by_one.insert_pop(time)
+
+            self.assertEqual(str(batched), str(one_by_one))
+            self.assertEqual([time for time, _ in batched.operations], [time for time, _ in one_by_one.operations])
+            for time, operation in one_by_one.operations:
+                self.assertIs(batched._find_operation(time).node.value, one_by_one._find_operation(time).node.value)
+
+    def test_delete_popped_push_then_pop(self):
+        prs = PartiallyRetroactiveStack()
+        prs.insert_push(value=2, time=10)
+        prs.insert_push(value=4, time=20)
+        prs.insert_pop(time=25)
+        prs.insert_push(value=6, time=30)
+        prs.delete_operation(time=20)
+
+        self.assertEqual(str(prs), "Stack = [6]\t\t(Top=6)")
+        prs.delete_operation(time=25)
+        self.assertEqual(str(prs), "Stack = [6, 2]\t\t(Top=6)")
+
+    def test_edits_before_popped_pushes(self):
+        prs = PartiallyRetroactiveStack.from_operations(
+            (time, time % 20 == 0, time) for time in range(100, 300, 10)
+        )
+        prs.insert_push(value=1, time=10)
+        prs.insert_push(value=2, time=20)
+        prs.insert_pop(time=15)
+
+        self.assertEqual(str(prs), "Stack = [2]\t\t(Top=2)")
+        self.assertRaises(ValueError, prs.delete_operation, 10)
+        prs.delete_operation(time=15)
+        self.assertEqual(str(prs), "Stack = [2, 1]\t\t(Top=2)")
+
+    def test_insert_push_before_pop(self):
+        prs = PartiallyRetroactiveStack()
+        prs.insert_push(value=86, time=52)
+        prs.insert_pop(time=279)
+        prs.insert_push(value=4, time=216)
+
+        self.assertEqual(str(prs), "Stack = [86]\t\t(Top=86)")
+        self.assertEqual(prs._find_operation(279).node.value, 4)
+
+    def test_matches_replay(self):
+        for seed in range(50):
+            rng = random.Random(seed)
+            prs = PartiallyRetroactiveStack()
+            operations = {}
+            for _ in range(60):
+                time = rng.randrange(100)
+                choice = rng.random()
+                if choice < 0.8 and time in operations:
+                    continue
+                if choice < 0.45:
+                    prs.insert_push(value=time, time=time)
+                    operations[time] = (True, time)
+                elif choice < 0.8:
+                    expected = replay({**operations, time: (False, None)})
+                    self.assertEqual(prs.insert_pop(time=time) is None, expected is None)
+                    if expected is not None:
+                        operations[time] = (False, None)
+                elif operations:
+                    time = rng.choice(sorted(operations))
+                    remaining = {key: value for key, value in operations.items() if key != time}
+                    if replay(remaining) is None:
+                        self.assertRaises(ValueError, prs.delete_operation, time)
+                    else:
+                        prs.delete_operation(time=time)
+                        operations = remaining
+
+                stack, popped = replay(operations)
+                self.assertEqual([node.value for node in prs], stack[::-1])
+                self.assertEqual(prs.get_top(), stack[-1] if stack else None)
+                for time, value in popped.items():
+                    self.assertEqual(prs._find_operation(time).node.value, value)
+
+    def test_datetime_times(self):
+        start = datetime.datetime(2024, 1, 1)
+        prs = PartiallyRetroactiveStack(next_time=lambda time: start if time is None else time + datetime.timedelta(seconds=1))
+        prs.insert_push(value=2)
+        prs.insert_push(value=4)
+        prs.insert_pop(time=start + datetime.timedelta(milliseconds=500))
+        prs.insert_push(value=6)
+
+        self.assertEqual(prs.get_max_time(), start + datetime.timedelta(seconds=2))
+        self.assertEqual(str(prs), "Stack = [6, 4]\t\t(Top=6)")
+
+    def test_save_load(self):
+        prs = PartiallyRetroactiveStack()
+        prs.insert_push(value=2, time=10)
+        prs.insert_push(value=4, time=20)
+        prs.insert_push(value=6, time=30)
+        prs.insert_pop(time=28)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stack.bin')
+            prs.save(path)
+            loaded = PartiallyRetroactiveStack.load(path)
+
+        self.assertEqual(str(loaded), "Stack = [6, 2]\t\t(Top=6)")
+        loaded.delete_operation(time=28)
+        self.assertEqual(str(loaded), "Stack = [6, 4, 2]\t\t(Top=6)")
@@ -0,0 +1,74 @@
+import unittest
+from retroactive_data_structures.partially_retroactive_priority_queue.persistent_treap import PersistentTreap, \
+    PersistentZeroPrefixTreap
+
+
+class PersistentTreapTests(unittest.TestCase):
+
+    def test_snapshot_is_not_modified(self):
+        treap = PersistentTreap(min)
+        for key in [5, 1, 4, 2, 3]:
+            treap.insert(key, key * 10)
+        snapshot = treap.snapshot()
+        treap.insert(0, 0)
+        treap.insert(4, 45)
+        treap.delete(1)
+
+        self.assertEqual(list(snapshot), [(1, 10), (2, 20), (3, 30), (4, 40), (5, 50)])
+        self.assertEqual(snapshot.aggregate(), 10)
+        self.assertEqual(list(treap), [(0, 0), (2, 20), (3, 30), (4, 45), (5, 50)])
+        self.assertEqual(treap.aggregate(), 0)
+        self.assertEqual((len(snapshot), len(treap)), (5, 5))
+
+    def test_updates_share_nodes(self):
+        treap = PersistentTreap(min)
+        for key in range(1000):
+            treap.insert(key, key)
+        snapshot = treap.snapshot()
+        treap.insert(500, -1)
+
+        def nodes(root):
+            stack, result = [root], set()
+            while stack:
+                node = stack.pop()
+                if node is not None:
+                    result.add(id(node))
+                    stack.extend((node.left, node.right))
+            return result
+
+        self.assertLess(len(nodes(treap._root) - nodes(snapshot._root)), 50)
+        self.assertEqual(treap.aggregate_before(600), -1)
+        self.assertEqual(snapshot.aggregate_before(600), 0)
+
+    def test_zero_prefix_snapshot(self):
+        treap = PersistentZeroPrefixTreap()
+        treap[10] = 1
+        treap[20] = -1
+        snapshot = treap.snapshot()
+        treap[15] = -1
+
+        self.assertEqual(snapshot.zero_prefix_after(10), 20)
+        self.assertEqual(treap.zero_prefix_after(10), 15)
+
+    def test_updates_between_snapshots(self):
+        treap = PersistentTreap(min)
+        expected = {}
+        versions = []
+        for step in range(300):
+            key = (step * 37) % 101
+            if key in expected and step % 3 == 0:
+                treap.delete(key)
+                del expected[key]
+            else:
+                treap.insert(key, step)
+                expected[key] = step
+            if step % 7 == 0:
+                versions.append((treap.snapshot(), sorted(expected.items())))
+        branch = versions[10][0]
+        branch.insert(-1, -1)
+
+        for snapshot, items in versions[:10] + versions[11:]:
+            self.assertEqual(list(snapshot), items)
+            self.assertEqual(snapshot.aggregate(), min(value for _, value in items))
+        self.assertEqual(list(branch), [(-1, -1)] + versions[10][1])
+        self.assertEqual(list(treap), sorted(expected.items()))
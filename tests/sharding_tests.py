@@ -0,0 +1,33 @@
+import unittest
+from retroactive_data_structures.sharding import RetroactiveShardManager
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_queue import PartiallyRetroactiveQueue
+from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import PartiallyRetroactivePriorityQueue
+
+
+class ShardingTests(unittest.TestCase):
+
+    def test_queues_by_key(self):
+        with RetroactiveShardManager(PartiallyRetroactiveQueue, processes=2) as manager:
+            for tenant in range(10):
+                manager.submit(tenant, 'insert_enqueue', tenant, 10)
+                manager.submit(tenant, 'insert_enqueue', tenant + 100, 20)
+                manager.submit(tenant, 'insert_dequeue', 15)
+            manager.submit(3, 'delete_operation', 15)
+
+            self.assertEqual(manager.flush(), [])
+            self.assertEqual(manager.read(3, 'get_first'), 3)
+            self.assertEqual(manager.read_many('get_first', range(3)), {0: 100, 1: 101, 2: 102})
+            self.assertEqual(manager.read('unknown', 'get_first'), None)
+
+    def test_failed_calls(self):
+        with RetroactiveShardManager(PartiallyRetroactivePriorityQueue, processes=2) as manager:
+            manager.submit('a', 'add_insert', 10, 2, "2")
+            manager.submit('a', 'add_insert', 10, 4, "4")
+            manager.submit('a', 'add_insert', 20, 1, "1")
+
+            self.assertEqual(manager.read('a', 'get_min'), (1, "1"))
+            failures = manager.flush()
+            self.assertEqual([failure[:3] for failure in failures], [('a', 'add_insert', (10, 4, "4"))])
+            self.assertIsInstance(failures[0][3], KeyError)
+            self.assertEqual(manager.flush(), [])
+            self.assertRaises(AttributeError, manager.read, 'a', 'get_first')
@@ -0,0 +1,25 @@
+import os
+import tempfile
+import unittest
+from retroactive_data_structures.snapshot import ColumnFile, save_columns
+
+
+class SnapshotTests(unittest.TestCase):
+
+    def test_column_types(self):
+        columns = [[1, -2, 3], [True, False], [0.5, 1.5], [None, None], [(1, 2), 'a'], [2 ** 70], []]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'columns.bin')
+            save_columns(path, columns)
+            with ColumnFile(path) as column_file:
+                loaded = [list(column_file.column(index)) for index in range(len(columns))]
+
+        self.assertEqual(loaded, columns)
+
+    def test_invalid_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'invalid.bin')
+            with open(path, 'wb') as file:
+                file.write(b'not a snapshot')
+
+            self.assertRaises(ValueError, ColumnFile, path)
@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+from retroactive_data_structures.streaming import AsyncPriorityQueue, AsyncQueue, AsyncStack
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_queue import PartiallyRetroactiveQueue
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_stack import PartiallyRetroactiveStack
+from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import PartiallyRetroactivePriorityQueue
+
+
+async def stream(operations):
+    for operation in operations:
+        yield operation
+
+
+class StreamingTests(unittest.TestCase):
+
+    def test_consume_queue(self):
+        queue = AsyncQueue(PartiallyRetroactiveQueue(), batch_size=2)
+
+        async def run():
+            count = await queue.consume(stream([(10, True, 2), (20, True, 4), (30, True, 6), (28, False, None), (15, True, 8)]))
+            return count, await queue.first(), await queue.last()
+
+        self.assertEqual(asyncio.run(run()), (5, 8, 6))
+        self.assertEqual(str(queue.structure), "Queue = [8, 4, 6]\t\t(First=8, Last=6)")
+
+    def test_consume_stack(self):
+        stack = AsyncStack(PartiallyRetroactiveStack(), batch_size=2)
+
+        async def run():
+            await stack.consume(stream([(10, True, 2), (20, True, 4), (30, True, 6), (28, False, None)]))
+            await stack.delete_operation(30)
+            return await stack.top()
+
+        self.assertEqual(asyncio.run(run()), 2)
+
+    def test_reads_see_pending_operations(self):
+        priority_queue = AsyncPriorityQueue(PartiallyRetroactivePriorityQueue(), batch_size=100)
+        incoming = asyncio.Queue()
+
+        async def operations():
+            while True:
+                operation = await incoming.get()
+                if operation is None:
+                    return
+                yield operation
+
+        async def run():
+            consumer = asyncio.ensure_future(priority_queue.consume(operations()))
+            await incoming.put((10, True, 6, "6"))
+            await incoming.put((20, True, 2, "2"))
+            await asyncio.sleep(0)
+            minimum = await priority_queue.min()
+            await incoming.put((15, False, None, None))
+            await incoming.put(None)
+            await consumer
+            return minimum, await priority_queue.min()
+
+        self.assertEqual(asyncio.run(run()), ((2, "2"), (2, "2")))
+        self.assertEqual(len(priority_queue.structure), 1)
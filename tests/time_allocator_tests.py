@@ -0,0 +1,36 @@
+import random
+import unittest
+from retroactive_data_structures.partially_retroactive_queue_and_stack.time_allocator import time_between, \
+    next_tuple_time
+
+
+class TimeAllocatorTests(unittest.TestCase):
+
+    def test_time_between(self):
+        self.assertEqual(time_between(None, None), (0,))
+        self.assertLess(time_between(None, (0,)), (0,))
+        self.assertGreater(time_between((0,), None), (0,))
+        self.assertRaises(ValueError, time_between, (1,), (1,))
+        self.assertRaises(ValueError, time_between, (2,), (1,))
+
+    def test_random_inserts_keep_order(self):
+        rng = random.Random(0)
+        times = [next_tuple_time(None)]
+        for _ in range(2000):
+            index = rng.randrange(-1, len(times))
+            before = times[index] if index >= 0 else None
+            after = times[index + 1] if index + 1 < len(times) else None
+            time = time_between(before, after)
+            times.insert(index + 1, time)
+
+        self.assertEqual(times, sorted(times))
+        self.assertEqual(len(set(times)), len(times))
+        self.assertLessEqual(max(len(time) for time in times), 2)
+
+    def test_insert_after_same_time(self):
+        times = [(0,), (10,)]
+        for _ in range(1000):
+            times.insert(1, time_between(times[0], times[1]))
+
+        self.assertEqual(times, sorted(times))
+        self.assertLessEqual(max(len(time) for time in times), 2)
@@ -0,0 +1,144 @@
+import operator
+import random
+import unittest
+from retroactive_data_structures.partially_retroactive_priority_queue.treap import MinTreapNode, Treap
+from retroactive_data_structures.partially_retroactive_priority_queue.zero_prefix_treap import ZeroPrefixTreap
+
+
+class TreapTests(unittest.TestCase):
+
+    def test_insert(self):
+        treap = Treap(min)
+        for key in [5, 1, 4, 2, 3]:
+            treap.insert(key, key * 10)
+
+        self.assertEqual(list(treap), [(1, 10), (2, 20), (3, 30), (4, 40), (5, 50)])
+        self.assertEqual(len(treap), 5)
+
+    def test_find_before_and_after(self):
+        treap = Treap(min)
+        for key in [5, 1, 4, 2, 3]:
+            treap.insert(key, key * 10)
+
+        self.assertEqual(treap.find_before(4).key, 3)
+        self.assertEqual(treap.find_after(4).key, 5)
+        self.assertIsNone(treap.find_before(1))
+        self.assertIsNone(treap.find_after(5))
+
+    def test_delete(self):
+        treap = Treap(min)
+        for key in [5, 1, 4, 2, 3]:
+            treap.insert(key, key * 10)
+        treap.delete(1)
+        treap.delete(4)
+
+        self.assertEqual(list(treap), [(2, 20), (3, 30), (5, 50)])
+        self.assertEqual(treap.aggregate(), 20)
+        self.assertFalse(treap.delete(1))
+
+    def test_aggregate_before_and_after(self):
+        treap = Treap(min)
+        for key in range(1, 11):
+            treap.insert(key, 100 - key)
+
+        self.assertEqual(treap.aggregate_before(4), 97)
+        self.assertEqual(treap.aggregate_before(4, include_eq=True), 96)
+        self.assertEqual(treap.aggregate_after(4), 90)
+        self.assertEqual(treap.aggregate_after(11), None)
+        self.assertEqual(list(treap), [(key, 100 - key) for key in range(1, 11)])
+
+    def test_deep_tree(self):
+        treap = Treap(min)
+        depth = 5000
+        nodes = [MinTreapNode(key, key) for key in range(depth)]
+        for key, node in enumerate(nodes):
+            node.priority = depth - key
+            node.right = nodes[key + 1] if key + 1 < depth else None
+        treap._root = nodes[0]
+        treap._len = depth
+        treap._root.split(depth)
+        treap.insert(depth, depth)
+        treap.delete(0)
+
+        self.assertEqual(treap.find(depth - 1).value, depth - 1)
+        self.assertEqual(len(list(treap)), depth)
+
+    def test_aggregate_does_not_modify_treap(self):
+        treap = Treap(min)
+        for key in range(1, 101):
+            treap.insert(key, key)
+        root = treap._root
+        items = list(treap)
+        treap.aggregate_before(50)
+        treap.aggregate_after(50)
+
+        self.assertIs(treap._root, root)
+        self.assertEqual(list(treap), items)
+
+    def test_zero_prefix_before_and_after(self):
+        bridges = ZeroPrefixTreap()
+        for key, value in [(10, 1), (15, 0), (20, 1), (28, -1), (29, -1), (40, 0)]:
+            bridges[key] = value
+
+        self.assertEqual(bridges.zero_prefix_before(5), 5)
+        self.assertEqual(bridges.zero_prefix_before(20), 10)
+        self.assertEqual(bridges.zero_prefix_before(35), 35)
+        self.assertEqual(bridges.zero_prefix_after(5), 5)
+        self.assertEqual(bridges.zero_prefix_after(15), 29)
+        self.assertEqual(bridges.zero_prefix_after(40), 40)
+
+    def test_prefix_sum_and_last_prefix_at_most(self):
+        weights = ZeroPrefixTreap()
+        for key, value in [(10, 1), (20, 1), (25, -1), (30, 1), (35, -1)]:
+            weights[key] = value
+
+        self.assertEqual([weights.prefix_sum(key) for key in [5, 10, 20, 25, 30, 35]], [0, 1, 2, 1, 2, 1])
+        self.assertEqual(weights.last_prefix_at_most(30, 1).key, 25)
+        self.assertEqual(weights.last_prefix_at_most(20, 1).key, 10)
+        self.assertIsNone(weights.last_prefix_at_most(35, 0))
+
+    def test_seeded_shape(self):
+        def shape(node):
+            return None if node is None else (node.key, shape(node.left), shape(node.right))
+
+        treaps = [Treap(min, seed=7), Treap(min, seed=7), Treap(min, seed=8)]
+        for treap in treaps:
+            for key in range(100):
+                treap.insert(key, key)
+
+        self.assertEqual(shape(treaps[0]._root), shape(treaps[1]._root))
+        self.assertNotEqual(shape(treaps[0]._root), shape(treaps[2]._root))
+
+    def test_global_random_state_is_not_used(self):
+        state = random.getstate()
+        treap = ZeroPrefixTreap()
+        for key in range(100):
+            treap[key] = 1
+        treap.build((key, 1) for key in range(100))
+
+        self.assertEqual(random.getstate(), state)
+
+    def test_aggregate_node_classes(self):
+        plain, total, product = Treap(), Treap(operator.add), Treap(lambda a, b: a * b)
+        for treap in [plain, total, product]:
+            for key in [5, 1, 4, 2, 3]:
+                treap.insert(key, key)
+            treap.delete(4)
+
+        self.assertIsNone(plain.aggregate())
+        self.assertIsNone(plain.aggregate_before(3))
+        self.assertFalse(hasattr(plain._root, "__dict__"))
+        self.assertEqual(total.aggregate(), 11)
+        self.assertEqual(total.aggregate_after(2), 8)
+        self.assertEqual(product.aggregate(), 30)
+        self.assertEqual(product.aggregate_before(3, include_eq=True), 6)
+
+    def test_function_node_class_is_shared(self):
+        def product(a, b):
+            return a * b
+
+        first, second = Treap(product), Treap(product)
+
+        self.assertIs(first._node_class, second._node_class)
+        self.assertIsNot(first._node_class, Treap(lambda a, b: a + b)._node_class)
+        self.assertIs(Treap(min)._node_class, Treap(min)._node_class)
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from retroactive_data_structures.write_ahead_log import WriteAheadLog, read_operations, read_records
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_queue import PartiallyRetroactiveQueue
+from retroactive_data_structures.partially_retroactive_queue_and_stack.partially_retroactive_stack import PartiallyRetroactiveStack
+from retroactive_data_structures.partially_retroactive_priority_queue.partially_retroactive_priority_queue import PartiallyRetroactivePriorityQueue
+
+
+class WriteAheadLogTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'operations.log')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_group_commit(self):
+        log = WriteAheadLog(self.path, group_size=3)
+        log.log_insert(10, True, 2)
+        log.log_insert(20, True, 4)
+        self.assertEqual(os.path.getsize(self.path), 0)
+        log.log_delete(10)
+        self.assertEqual(len(list(read_records(self.path))), 3)
+        log.close()
+
+        self.assertEqual(read_operations(self.path), [(20, True, 4, None)])
+
+    def test_torn_record(self):
+        with WriteAheadLog(self.path) as log:
+            log.log_insert(10, True, 2)
+            log.log_insert(20, True, 4)
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 1)
+
+        self.assertEqual(read_operations(self.path), [(10, True, 2, None)])
+
+    def test_reopen_after_torn_record(self):
+        with WriteAheadLog(self.path, group_size=1) as log:
+            log.log_insert(10, True, 'a')
+            log.log_insert(20, True, 'b')
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 3)
+        with WriteAheadLog(self.path, group_size=1) as log:
+            log.log_insert(30, True, 'c')
+            log.log_insert(40, True, 'd')
+
+        self.assertEqual(read_operations(self.path), [
+            (10, True, 'a', None), (30, True, 'c', None), (40, True, 'd', None)
+        ])
+
+    def test_queue_from_log(self):
+        prq = PartiallyRetroactiveQueue()
+        with WriteAheadLog(self.path) as log:
+            prq.log_to(log)
+            prq.insert_enqueue(value=2, time=10)
+            prq.insert_enqueue(value=4, time=20)
+            prq.insert_enqueue(value=6, time=30)
+            prq.insert_dequeue(time=28)
+            prq.apply_batch([(15, True, 8)])
+            prq.delete_operation(time=20)
+        loaded = PartiallyRetroactiveQueue.from_log(self.path)
+
+        self.assertEqual(str(prq), "Queue = [8, 6]\t\t(First=8, Last=6)")
+        self.assertEqual(str(loaded), str(prq))
+
+    def test_queue_from_log_after_retroactive_edits(self):
+        prq = PartiallyRetroactiveQueue()
+        with WriteAheadLog(self.path) as log:
+            prq.log_to(log)
+            prq.insert_enqueue(value=1, time=10)
+            prq.insert_dequeue(time=5)
+            prq.insert_enqueue(value=2, time=20)
+            prq.insert_dequeue(time=30)
+            prq.insert_enqueue(value=9, time=25)
+            prq.insert_enqueue(value=0, time=1)
+            prq.delete_operation(time=20)
+        loaded = PartiallyRetroactiveQueue.from_log(self.path)
+
+        self.assertEqual(str(prq), "Queue = [1, 9]\t\t(First=1, Last=9)")
+        self.assertEqual(str(loaded), str(prq))
+
+    def test_stack_from_log_after_retroactive_edits(self):
+        prs = PartiallyRetroactiveStack()
+        with WriteAheadLog(self.path) as log:
+            prs.log_to(log)
+            prs.insert_push(value=86, time=52)
+            prs.insert_pop(time=279)
+            prs.insert_push(value=4, time=216)
+            prs.insert_push(value=7, time=300)
+            prs.insert_pop(time=100)
+            prs.insert_push(value=5, time=20)
+        loaded = PartiallyRetroactiveStack.from_log(self.path)
+
+        self.assertEqual(str(prs), "Stack = [7, 5]\t\t(Top=7)")
+        self.assertEqual(str(loaded), str(prs))
+
+    def test_priority_queue_from_log(self):
+        prpq = PartiallyRetroactivePriorityQueue()
+        with WriteAheadLog(self.path) as log:
+            prpq.log_to(log)
+            prpq.apply_batch([(10, True, 2, "2"), (20, True, 6, "6")])
+            prpq.add_insert(30, 4, "4")
+            prpq.add_delete_min(25)
+            prpq.remove(10)
+        loaded = PartiallyRetroactivePriorityQueue.from_log(self.path)
+
+        self.assertEqual(loaded.peek_k(10), prpq.peek_k(10))